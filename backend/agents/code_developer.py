@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from backend.agents.base import BaseAgent
 from backend.protocol.models import Deliverable, DeliverableType, Skill, SubTask
-from backend.services.mistral_service import get_mistral_service
+from backend.services.mistral_service import get_mistral_service, model_metadata
 
 
 CODE_SYSTEM_PROMPT = """You are an expert software developer working on the AgentLance marketplace.
@@ -33,12 +33,13 @@ class CodeDeveloperAgent(BaseAgent):
             system_prompt=CODE_SYSTEM_PROMPT,
             model=(context.get("model_overrides", {}).get(Skill.CODE) if context else None)
                   or get_mistral_service()._settings.mistral_large_model,
+            on_delta=context.get("on_delta") if context else None,
         )
 
         return Deliverable(
             type=DeliverableType.CODE,
             content=content,
-            metadata={"agent": self.name, "subtask_id": subtask.id},
+            metadata={"agent": self.name, "subtask_id": subtask.id, **model_metadata()},
         )
 
     async def can_handle(self, subtask: SubTask) -> bool:
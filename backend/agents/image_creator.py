@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from backend.agents.base import BaseAgent
 from backend.protocol.models import Deliverable, DeliverableType, Skill, SubTask
-from backend.services.mistral_service import get_mistral_service
+from backend.services.mistral_service import get_mistral_service, model_metadata
 from backend.services.huggingface_service import get_huggingface_service
 
 
@@ -31,6 +31,7 @@ class ImageCreatorAgent(BaseAgent):
             messages=[{"role": "user", "content": description}],
             system_prompt=PROMPT_ENHANCE_SYSTEM,
         )
+        prompt_model = model_metadata()
 
         # Generate image via HuggingFace
         # Allow job-level model override for IMAGE skill
@@ -52,6 +53,7 @@ class ImageCreatorAgent(BaseAgent):
                 "agent": self.name,
                 "subtask_id": subtask.id,
                 "enhanced_prompt": enhanced_prompt,
+                **prompt_model,
             },
         )
 
@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import re
+from typing import AsyncIterator
+
 from backend.agents.base import BaseAgent
+from backend.config import get_settings
 from backend.protocol.models import (
     Deliverable,
     DeliverableType,
     JobDecomposition,
     Skill,
     SubTask,
+    SubTaskPlan,
 )
-from backend.services.mistral_service import get_mistral_service
+from backend.services.cache import TTLCache
+from backend.services.mistral_service import get_mistral_service, model_metadata
 
 
 DECOMPOSE_SYSTEM_PROMPT = """You are an expert project manager and task decomposer for the AgentLance marketplace.
@@ -40,19 +48,146 @@ Return a JSON object with this exact structure:
 }"""
 
 
+def decomposition_cache_key(text: str, model: str) -> str:
+    """Key on case- and whitespace-normalized job text, so near-identical jobs share an entry."""
+    normalized = re.sub(r"\s+", " ", text).strip().casefold()
+    return hashlib.sha256(f"{model}\n{normalized}".encode()).hexdigest()
+
+
+_cache: TTLCache | None = None
+
+
+def get_decomposition_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = TTLCache(
+            max_entries=settings.decomposition_cache_size,
+            ttl_seconds=settings.decomposition_cache_ttl_seconds,
+            disk_dir=settings.decomposition_cache_dir,
+            disk_max_bytes=settings.decomposition_cache_disk_max_bytes,
+        )
+    return _cache
+
+
+class SubtaskArrayParser:
+    """Incrementally extracts complete objects from the top-level "subtasks" array.
+
+    Feed it JSON text as it streams in; each call returns the subtask objects whose
+    closing brace has arrived since the previous call.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key = ""
+        self._in_subtasks = False
+        self._object_start: int | None = None
+
+    def feed(self, text: str) -> list[dict]:
+        self._buf += text
+        found = []
+        buf = self._buf
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_key = buf[self._string_start + 1:i]
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if ch == "[" and self._stack == ["{"] and self._last_key == "subtasks":
+                    self._in_subtasks = True
+                elif ch == "{" and self._in_subtasks and len(self._stack) == 2:
+                    self._object_start = i
+                self._stack.append(ch)
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if ch == "}" and self._in_subtasks and len(self._stack) == 2 and self._object_start is not None:
+                    try:
+                        found.append(json.loads(buf[self._object_start:i + 1]))
+                    except ValueError:
+                        pass
+                    self._object_start = None
+                elif ch == "]" and self._in_subtasks and len(self._stack) == 1:
+                    self._in_subtasks = False
+        self._pos = len(buf)
+        return found
+
+
+class DecompositionStream:
+    """Async iterator over SubTaskPlans as the orchestrator produces them.
+
+    `decomposition` holds the full, validated result once iteration finishes, and
+    `model_info` which model produced it (empty for a cache hit).
+    """
+
+    def __init__(self, description: str):
+        self._description = description
+        self.decomposition: JobDecomposition | None = None
+        self.cache_hit = False
+        self.model_info: dict = {}
+
+    async def __aiter__(self) -> AsyncIterator[SubTaskPlan]:
+        cache = get_decomposition_cache()
+        model = get_settings().mistral_large_model
+        key = decomposition_cache_key(self._description, model)
+
+        cached = cache.get(key)
+        if cached is not None:
+            self.cache_hit = True
+            self.decomposition = JobDecomposition.model_validate(cached)
+            for plan in self.decomposition.subtasks:
+                yield plan
+            return
+
+        parser = SubtaskArrayParser()
+        chunks: list[str] = []
+        async for delta in get_mistral_service().chat_stream(
+            messages=[{"role": "user", "content": self._description}],
+            model=model,
+            system_prompt=DECOMPOSE_SYSTEM_PROMPT,
+            json_mode=True,
+            use_cache=False,  # the decomposition cache above already covers this call
+        ):
+            chunks.append(delta)
+            for obj in parser.feed(delta):
+                yield SubTaskPlan.model_validate(obj)
+
+        self.decomposition = JobDecomposition.model_validate_json("".join(chunks))
+        self.model_info = model_metadata()
+        # Only cache plans from the requested model, not a degraded fallback tier
+        if "fallback_from" not in self.model_info:
+            cache.set(key, self.decomposition.model_dump(mode="json"))
+
+
 class OrchestratorAgent(BaseAgent):
     name = "Mistral AI"
     skills = [Skill.ORCHESTRATION]
 
+    def stream(self, subtask: SubTask) -> DecompositionStream:
+        """Decompose a job, yielding each subtask plan as soon as it has been generated."""
+        return DecompositionStream(subtask.description)
+
     async def execute(self, subtask: SubTask, context: dict | None = None) -> Deliverable:
         """For the orchestrator, 'execute' means decomposing a job description."""
-        mistral = get_mistral_service()
-
-        decomposition = await mistral.parse(
-            messages=[{"role": "user", "content": subtask.description}],
-            response_model=JobDecomposition,
-            system_prompt=DECOMPOSE_SYSTEM_PROMPT,
-        )
+        stream = self.stream(subtask)
+        async for _ in stream:
+            pass
+        decomposition = stream.decomposition
 
         return Deliverable(
             type=DeliverableType.TEXT,
@@ -61,6 +196,8 @@ class OrchestratorAgent(BaseAgent):
                 "agent": self.name,
                 "subtask_id": subtask.id,
                 "decomposition": decomposition.model_dump(),
+                "cache_hit": stream.cache_hit,
+                **stream.model_info,
             },
         )
 
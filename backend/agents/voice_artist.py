@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import re
+from typing import AsyncIterable
+
 from backend.agents.base import BaseAgent
+from backend.config import get_settings
 from backend.protocol.models import Deliverable, DeliverableType, Skill, SubTask
-from backend.services.mistral_service import get_mistral_service
+from backend.services.mistral_service import get_mistral_service, model_metadata
 from backend.services.elevenlabs_service import get_elevenlabs_service
 
 
@@ -13,6 +18,42 @@ for natural spoken narration. Keep it concise, conversational, and engaging.
 Remove any markdown formatting, links, or visual-only elements.
 Output ONLY the polished script text, nothing else."""
 
+SEGMENT_POLISH_PROMPT = SCRIPT_POLISH_PROMPT + """
+The text is one segment of a longer piece that is narrated segment by segment.
+Adapt only this segment: do not add introductions, transitions, or conclusions."""
+
+
+class SentenceChunker:
+    """Splits streamed text into chunks of whole sentences at least `min_chars` long."""
+
+    # Sentence-ending punctuation (plus closing quotes/brackets) followed by
+    # whitespace, or a line break. Trailing whitespace is required so "3." in
+    # "3.14" is not mistaken for a boundary before the rest arrives.
+    _BOUNDARY = re.compile(r"[.!?\u2026]+[\"')\]\u201d\u2019]*\s+|\n+")
+
+    def __init__(self, min_chars: int):
+        self._min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        chunks = []
+        while (end := self._split_point()) is not None:
+            chunk, self._buffer = self._buffer[:end].strip(), self._buffer[end:]
+            if chunk:
+                chunks.append(chunk)
+        return chunks
+
+    def flush(self) -> str:
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest
+
+    def _split_point(self) -> int | None:
+        for match in self._BOUNDARY.finditer(self._buffer):
+            if match.end() >= self._min_chars:
+                return match.end()
+        return None
+
 
 class VoiceArtistAgent(BaseAgent):
     name = "Voice Artist"
@@ -21,6 +62,11 @@ class VoiceArtistAgent(BaseAgent):
     async def execute(self, subtask: SubTask, context: dict | None = None) -> Deliverable:
         mistral = get_mistral_service()
         elevenlabs = get_elevenlabs_service()
+        model = context.get("model_overrides", {}).get(Skill.VOICE) if context else None
+
+        # Pipelined handoff: the writer is still generating, narrate as it goes
+        if context and "input_stream" in context:
+            return await self._narrate_stream(subtask, context["input_stream"], model)
 
         # Get the text to narrate — from context (handoff) or subtask description
         raw_text = subtask.description
@@ -31,8 +77,9 @@ class VoiceArtistAgent(BaseAgent):
         script = await mistral.chat(
             messages=[{"role": "user", "content": raw_text}],
             system_prompt=SCRIPT_POLISH_PROMPT,
-            model=context.get("model_overrides", {}).get(Skill.VOICE) if context else None,
+            model=model,
         )
+        script_model = model_metadata()
 
         # Generate audio via ElevenLabs
         filename, filepath = await elevenlabs.text_to_speech(text=script)
@@ -46,6 +93,82 @@ class VoiceArtistAgent(BaseAgent):
                 "agent": self.name,
                 "subtask_id": subtask.id,
                 "script": script,
+                **script_model,
+            },
+        )
+
+    async def _narrate_stream(
+        self,
+        subtask: SubTask,
+        stream: AsyncIterable[str],
+        model: str | None,
+    ) -> Deliverable:
+        """Polish and synthesize upstream text sentence chunk by sentence chunk.
+
+        Chunks are dispatched as soon as they are complete, with a bounded number
+        in flight, and their MP3 bytes are joined in order into one file.
+        """
+        mistral = get_mistral_service()
+        elevenlabs = get_elevenlabs_service()
+        settings = get_settings()
+        chunker = SentenceChunker(settings.voice_chunk_min_chars)
+        limit = asyncio.Semaphore(settings.voice_chunk_concurrency)
+        scripts: list[asyncio.Task[str]] = []
+        audio: list[asyncio.Task[bytes]] = []
+
+        served: list[dict] = []
+
+        async def polish(text: str) -> str:
+            async with limit:
+                script = await mistral.chat(
+                    messages=[{"role": "user", "content": text}],
+                    system_prompt=SEGMENT_POLISH_PROMPT,
+                    model=model,
+                )
+            served.append(model_metadata())
+            return script
+
+        async def synthesize(script: asyncio.Task[str], previous: asyncio.Task[str] | None) -> bytes:
+            text = await script
+            previous_text = await previous if previous else None
+            async with limit:
+                return await elevenlabs.synthesize(text, previous_text=previous_text)
+
+        def dispatch(chunk: str):
+            previous = scripts[-1] if scripts else None
+            scripts.append(asyncio.create_task(polish(chunk)))
+            audio.append(asyncio.create_task(synthesize(scripts[-1], previous)))
+
+        try:
+            async for text in stream:
+                for chunk in chunker.feed(text):
+                    dispatch(chunk)
+            if rest := chunker.flush():
+                dispatch(rest)
+            if not audio:
+                raise ValueError("No text to narrate")
+            segments = await asyncio.gather(*audio)
+        except BaseException:
+            for task in (*scripts, *audio):
+                task.cancel()
+            await asyncio.gather(*scripts, *audio, return_exceptions=True)
+            raise
+
+        script = " ".join(task.result() for task in scripts)
+        filename, filepath = await elevenlabs.save_audio(b"".join(segments))
+
+        return Deliverable(
+            type=DeliverableType.AUDIO,
+            content=f"/static/deliverables/{filename}",
+            filename=filename,
+            mime_type="audio/mpeg",
+            metadata={
+                "agent": self.name,
+                "subtask_id": subtask.id,
+                "script": script,
+                "segments": len(segments),
+                # A segment that fell back to another model is the one worth reporting
+                **max(served, key=lambda m: "fallback_from" in m, default={}),
             },
         )
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from backend.agents.base import BaseAgent
 from backend.protocol.models import Deliverable, DeliverableType, Skill, SubTask
-from backend.services.mistral_service import get_mistral_service
+from backend.services.mistral_service import get_mistral_service, model_metadata
 
 
 WRITER_SYSTEM_PROMPT = """You are a professional content writer working on the AgentLance marketplace.
@@ -32,12 +32,13 @@ class WriterAgent(BaseAgent):
             messages=[{"role": "user", "content": user_msg}],
             system_prompt=WRITER_SYSTEM_PROMPT,
             model=context.get("model_overrides", {}).get(Skill.WRITING) if context else None,
+            on_delta=context.get("on_delta") if context else None,
         )
 
         return Deliverable(
             type=DeliverableType.TEXT,
             content=content,
-            metadata={"agent": self.name, "subtask_id": subtask.id},
+            metadata={"agent": self.name, "subtask_id": subtask.id, **model_metadata()},
         )
 
     async def can_handle(self, subtask: SubTask) -> bool:
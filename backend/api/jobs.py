@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 import logging
 
+from backend.config import get_settings
+from backend.protocol.classifier import detect_skills_by_keyword, get_skill_classifier
 from backend.protocol.models import Job, JobRating, JobRequest, Skill
-from backend.protocol.router import get_router
+from backend.protocol.router import JobQueueFull, get_router
 
 logger = logging.getLogger(__name__)
 
@@ -14,13 +16,16 @@ router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 
 @router.get("", response_model=list[Job])
-async def list_jobs():
-    return get_router().list_jobs()
+async def list_jobs(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    return await get_router().list_jobs(limit=limit, offset=offset)
 
 
 @router.get("/{job_id}", response_model=Job)
 async def get_job(job_id: str):
-    job = get_router().get_job(job_id)
+    job = await get_router().get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
@@ -31,7 +36,7 @@ async def submit_job(req: JobRequest):
     # Auto-detect skills if not provided
     skills = req.required_skills
     if not skills:
-        skills = _detect_skills(req.description)
+        skills = await _detect_skills(req.description)
 
     model_overrides = _sanitize_model_overrides(req.model_overrides)
 
@@ -44,7 +49,14 @@ async def submit_job(req: JobRequest):
         model_overrides=model_overrides,
     )
 
-    return await get_router().submit_job(job)
+    try:
+        return await get_router().submit_job(job)
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
 
 @router.post("/{job_id}/rate", response_model=Job)
@@ -55,26 +67,12 @@ async def rate_job(job_id: str, rating: JobRating):
     return job
 
 
-def _detect_skills(description: str) -> list[Skill]:
-    """Simple keyword-based skill detection as a fallback."""
-    desc_lower = description.lower()
-    skills = []
-
-    writing_keywords = ["blog", "write", "article", "copy", "script", "content", "post", "story", "documentation"]
-    voice_keywords = ["voice", "audio", "narrat", "voiceover", "speak", "podcast", "tts"]
-    image_keywords = ["image", "logo", "banner", "illustration", "design", "visual", "picture", "photo", "graphic"]
-    code_keywords = ["code", "develop", "program", "function", "api", "app", "software", "debug", "review"]
-
-    if any(kw in desc_lower for kw in writing_keywords):
-        skills.append(Skill.WRITING)
-    if any(kw in desc_lower for kw in voice_keywords):
-        skills.append(Skill.VOICE)
-    if any(kw in desc_lower for kw in image_keywords):
-        skills.append(Skill.IMAGE)
-    if any(kw in desc_lower for kw in code_keywords):
-        skills.append(Skill.CODE)
-
-    return skills or [Skill.WRITING]  # default to writing
+async def _detect_skills(description: str) -> list[Skill]:
+    """Embedding-based skill detection, falling back to keywords."""
+    if not get_settings().skill_classifier_enabled:
+        return detect_skills_by_keyword(description)
+    # Concurrent submissions share one embedding batch
+    return (await get_skill_classifier().classify([description]))[0]
 
 
 def _sanitize_model_overrides(overrides: dict[str, str]) -> dict[str, str]:
@@ -6,8 +6,18 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from backend.agents.orchestrator import get_decomposition_cache
+from backend.protocol.classifier import get_skill_classifier
 from backend.protocol.mesh import get_mesh
 from backend.protocol.registry import get_registry
+from backend.protocol.router import get_router
+from backend.services.breaker import breaker_stats
+from backend.services.embeddings import get_embedding_service
+from backend.services.elevenlabs_service import get_elevenlabs_service
+from backend.services.huggingface_service import get_huggingface_service
+from backend.services.limiter import limiter_stats
+from backend.services.mistral_service import get_mistral_service
+from backend.services.transport import get_transport
 from backend.db.database import get_db
 from backend.db.models import ModelRecord
 
@@ -73,4 +83,24 @@ async def health():
         "status": "healthy",
         "agents_total": len(agents),
         "agents_available": sum(1 for a in agents if a.status.value == "available"),
+        "slots": registry.slot_stats(),
+        "job_queue": get_router().queue_stats(),
+        "selection": get_router().agent_stats(),
+    }
+
+
+@router.get("/metrics")
+async def metrics():
+    return {
+        "caches": {
+            "decomposition": get_decomposition_cache().stats(),
+            "mistral": get_mistral_service().cache_stats(),
+            "tts": get_elevenlabs_service().cache_stats(),
+            "image": get_huggingface_service().cache_stats(),
+            "embeddings": get_embedding_service().stats(),
+        },
+        "transport": get_transport().stats(),
+        "limits": limiter_stats(),
+        "breakers": breaker_stats(),
+        "skill_classifier": get_skill_classifier().stats(),
     }
@@ -0,0 +1,106 @@
+"""Helpers shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def configure_environment(seed: int, latency_scale: float = 1.0) -> Path:
+    """Point settings at simulated providers and a throwaway working directory.
+
+    Must run before anything imports backend.config. Variables already set in
+    the environment win, so a run can still be tuned from outside. Returns the
+    temporary directory holding the database, deliverables and media cache;
+    the caller removes it with remove_workdir().
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="agentlance-bench-"))
+    defaults = {
+        "SIMULATE_PROVIDERS": "true",
+        "SIM_SEED": str(seed),
+        "DATABASE_URL": f"sqlite+aiosqlite:///{workdir / 'bench.db'}",
+        "DELIVERABLES_DIR": str(workdir / "deliverables"),
+        "MEDIA_CACHE_DIR": str(workdir / "cache"),
+        "EMBEDDING_CACHE_DIR": "",
+        "MISTRAL_CACHE_DIR": "",
+        "DECOMPOSITION_CACHE_DIR": "",
+    }
+    if latency_scale != 1.0:
+        defaults.update({
+            "SIM_MISTRAL_FIRST_TOKEN_MS": str(400.0 * latency_scale),
+            "SIM_MISTRAL_TOKENS_PER_SECOND": str(60.0 / latency_scale),
+            "SIM_ELEVENLABS_LATENCY_MS": str(900.0 * latency_scale),
+            "SIM_HF_IMAGE_LATENCY_MS": str(2500.0 * latency_scale),
+            "SIM_HF_EMBEDDING_LATENCY_MS": str(60.0 * latency_scale),
+        })
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    return workdir
+
+
+def remove_workdir(workdir: Path):
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+def summarize(values: list[float], scale: float = 1.0, digits: int = 3) -> dict:
+    """Count, mean and p50/p95/p99/max of `values`, multiplied by `scale`."""
+    if not values:
+        return {"count": 0}
+    arr = np.asarray(values, dtype=np.float64) * scale
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "count": len(values),
+        "mean": round(float(arr.mean()), digits),
+        "p50": round(float(p50), digits),
+        "p95": round(float(p95), digits),
+        "p99": round(float(p99), digits),
+        "max": round(float(arr.max()), digits),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def environment_info() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(results: dict, output: str | None, name: str) -> Path:
+    """Write results as JSON to `output`, or a timestamped file under results/."""
+    if output:
+        path = Path(output)
+    else:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        path = RESULTS_DIR / f"{name}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+    return path
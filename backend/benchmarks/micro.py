@@ -0,0 +1,274 @@
+"""Micro-benchmarks for the per-event hot paths, at 10 to 10k subscribers, events and agents.
+
+Cases:
+  mesh.emit              one event broadcast to N mesh subscribers plus N job subscribers
+  mesh.broadcast_job     one high-frequency event to N job subscribers
+  mesh.get_events.job    one job's events out of an N-event history
+  mesh.get_events.recent the last 50 of an N-event history
+  registry.find_by_skill candidates for a skill among N agents
+  registry.acquire       take and release a slot among N agents
+  serialize.event        MeshEvent.model_dump_json
+  serialize.job          Job with N subtasks, to JSON and back
+
+Each case reports the median and best time per operation over several
+repeats. Save a run as a baseline and compare later runs against it:
+
+    python -m backend.benchmarks.micro --save-baseline baseline.json
+    python -m backend.benchmarks.micro --compare baseline.json   # exit 1 on regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from backend.benchmarks.common import configure_environment, environment_info, remove_workdir, write_results
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+
+class NullWebSocket:
+    """Stands in for a connected client; send_json only counts."""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send_json(self, data):
+        self.sent += 1
+
+
+async def measure(fn: Callable[[], Awaitable | object], min_time: float, repeats: int) -> dict:
+    """Time `fn` (sync or async) per call, calibrating the loop count so each repeat takes ~min_time."""
+    is_async = inspect.iscoroutinefunction(fn)
+
+    async def batch(n: int) -> float:
+        start = time.perf_counter()
+        if is_async:
+            for _ in range(n):
+                await fn()
+        else:
+            for _ in range(n):
+                fn()
+        return time.perf_counter() - start
+
+    number = 1
+    while (elapsed := await batch(number)) < min_time and number < 1_000_000:
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    per_op = [await batch(number) / number for _ in range(repeats)]
+    return {
+        "median_us": round(statistics.median(per_op) * 1e6, 3),
+        "best_us": round(min(per_op) * 1e6, 3),
+        "loops": number,
+    }
+
+
+def _event(job_id: str | None = None, kind: str = "subtask_started"):
+    from backend.protocol.models import MeshEvent, MeshEventType
+
+    return MeshEvent(
+        type=MeshEventType(kind),
+        job_id=job_id,
+        agent_id="agent",
+        subtask_id="subtask",
+        data={"title": "Write the introduction", "agent_name": "Writer"},
+    )
+
+
+def case_mesh_emit(n: int):
+    from backend.protocol.mesh import MeshNetwork
+
+    mesh = MeshNetwork()
+    for _ in range(n):
+        mesh._mesh_subscribers.append(NullWebSocket())
+    mesh._job_subscribers["job"] = [NullWebSocket() for _ in range(n)]
+    event = _event("job")
+
+    async def emit():
+        await mesh.emit(event)
+        mesh._events.clear()  # keep history from growing across loops
+
+    return emit
+
+
+def case_mesh_broadcast_job(n: int):
+    from backend.protocol.mesh import MeshNetwork
+
+    mesh = MeshNetwork()
+    mesh._job_subscribers["job"] = [NullWebSocket() for _ in range(n)]
+    event = _event("job", kind="subtask_delta")
+
+    async def broadcast():
+        await mesh.broadcast_job(event)
+
+    return broadcast
+
+
+def _mesh_with_history(n: int):
+    from backend.protocol.mesh import MeshNetwork
+
+    mesh = MeshNetwork()
+    jobs = max(1, n // 10)  # about ten events per job
+    for i in range(n):
+        mesh._events.append(_event(f"job-{i % jobs}"))
+    return mesh
+
+
+def case_get_events_job(n: int):
+    mesh = _mesh_with_history(n)
+    return lambda: mesh.get_events(job_id="job-0")
+
+
+def case_get_events_recent(n: int):
+    mesh = _mesh_with_history(n)
+    return lambda: mesh.get_events(limit=50)
+
+
+def _registry(n: int):
+    from backend.protocol.models import AgentProfile, Skill
+    from backend.protocol.registry import AgentRegistry
+
+    registry = AgentRegistry()
+    skills = list(Skill)
+    for i in range(n):
+        profile = AgentProfile(
+            name=f"Agent {i}",
+            role="Benchmark",
+            skills=[skills[i % len(skills)]],
+            description="Benchmark agent",
+        )
+        registry.register(profile, None)
+    return registry
+
+
+def case_find_by_skill(n: int):
+    from backend.protocol.models import Skill
+
+    registry = _registry(n)
+    return lambda: registry.find_by_skill(Skill.WRITING)
+
+
+def case_acquire(n: int):
+    from backend.protocol.models import Skill
+
+    registry = _registry(n)
+
+    def acquire_release():
+        profile = registry.try_acquire(Skill.WRITING)
+        registry.release(profile.id)
+
+    return acquire_release
+
+
+def case_serialize_event(n: int):
+    event = _event("job")
+    return event.model_dump_json
+
+
+def case_serialize_job(n: int):
+    from backend.protocol.models import Job, Skill, SubTask
+
+    job = Job(title="Benchmark", description="Benchmark job", required_skills=[Skill.WRITING])
+    job.subtasks = [
+        SubTask(job_id=job.id, title=f"Subtask {i}", description="Do the thing", required_skill=Skill.WRITING)
+        for i in range(n)
+    ]
+
+    def round_trip():
+        Job.model_validate_json(job.model_dump_json())
+
+    return round_trip
+
+
+# name -> (factory, whether it scales with n)
+CASES: dict[str, tuple[Callable, bool]] = {
+    "mesh.emit": (case_mesh_emit, True),
+    "mesh.broadcast_job": (case_mesh_broadcast_job, True),
+    "mesh.get_events.job": (case_get_events_job, True),
+    "mesh.get_events.recent": (case_get_events_recent, True),
+    "registry.find_by_skill": (case_find_by_skill, True),
+    "registry.acquire": (case_acquire, True),
+    "serialize.event": (case_serialize_event, False),
+    "serialize.job": (case_serialize_job, True),
+}
+
+
+async def run(args) -> dict:
+    results = {}
+    for name, (factory, scales) in CASES.items():
+        if args.filter and args.filter not in name:
+            continue
+        for n in args.sizes if scales else [1]:
+            key = f"{name}[n={n}]" if scales else name
+            results[key] = await measure(factory(n), args.min_time, args.repeats)
+            print(f"{key:40s} {results[key]['median_us']:>14.3f} us", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a comparison table; return the cases slower than baseline by more than `threshold`."""
+    regressions = []
+    print(f"\n{'case':40s} {'baseline us':>14s} {'current us':>14s} {'change':>9s}")
+    for key, current in results.items():
+        before = baseline.get(key)
+        if before is None:
+            print(f"{key:40s} {'-':>14s} {current['median_us']:>14.3f} {'new':>9s}")
+            continue
+        change = current["median_us"] / before["median_us"] - 1 if before["median_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:40s} {before['median_us']:>14.3f} {current['median_us']:>14.3f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated subscriber/event/agent counts")
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.05, help="target seconds per repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("-o", "--output", help="results file (default: backend/benchmarks/results/)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="also write the results here as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown counted as a regression (default 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    args.sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    return args
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    workdir = configure_environment(seed=0)
+    # Keep registration from starting background embedding work
+    os.environ.setdefault("SEMANTIC_MATCHING", "false")
+
+    try:
+        results = {"environment": environment_info(), "results": asyncio.run(run(args))}
+    finally:
+        remove_workdir(workdir)
+    path = write_results(results, args.output, "micro")
+    print(f"Results written to {path}")
+    if args.save_baseline:
+        write_results(results, args.save_baseline, "baseline")
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+        regressions = compare(results["results"], baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
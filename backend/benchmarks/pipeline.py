@@ -0,0 +1,337 @@
+"""End-to-end pipeline benchmark — drives the FastAPI app in-process with simulated providers.
+
+Scenarios:
+  simple        N concurrent single-skill jobs (router -> one agent)
+  orchestrated  N concurrent multi-skill jobs (decomposition + subtask graph)
+  websocket     M /ws/mesh subscribers watching a batch of simple jobs
+
+Jobs are submitted over HTTP through httpx's ASGITransport; WebSocket clients
+speak raw ASGI to the endpoints in backend/api/ws.py, so the mesh broadcast
+path is exercised without a server or sockets. Job completion is observed the
+same way the frontend does it, from JOB_COMPLETED / JOB_FAILED events.
+
+Reports jobs/sec, p50/p95/p99 time to completion, event-loop lag and peak
+RSS, and writes them as JSON:
+
+    python -m backend.benchmarks.pipeline --jobs 50 --subscribers 500
+    python -m backend.benchmarks.pipeline --scenarios simple --latency-scale 0.1 -o out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import httpx
+
+from backend.benchmarks.common import (
+    configure_environment,
+    environment_info,
+    peak_rss_mb,
+    remove_workdir,
+    summarize,
+    write_results,
+)
+
+SCENARIOS = ("simple", "orchestrated", "websocket")
+TERMINAL_EVENTS = {"job_completed": "completed", "job_failed": "failed"}
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes a task that sleeps for `interval` seconds."""
+
+    def __init__(self, interval: float = 0.01):
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.samples: list[float] = []
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self._interval))
+
+    def __enter__(self) -> LoopLagMonitor:
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+class ASGIWebSocket:
+    """Minimal WebSocket client that calls the ASGI app directly.
+
+    Counts every message; with `on_event` set it also decodes each one and
+    passes (event dict, receive time).
+    """
+
+    def __init__(self, app, path: str, on_event=None):
+        self._app = app
+        self._path = path
+        self._on_event = on_event
+        self._inbox: asyncio.Queue[dict] = asyncio.Queue()
+        self._accepted = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.received = 0
+
+    async def connect(self):
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "http_version": "1.1",
+            "path": self._path,
+            "raw_path": self._path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+            "subprotocols": [],
+        }
+        await self._inbox.put({"type": "websocket.connect"})
+        self._task = asyncio.create_task(self._app(scope, self._inbox.get, self._send))
+        await self._accepted.wait()
+
+    async def _send(self, message: dict):
+        kind = message["type"]
+        if kind == "websocket.accept":
+            self._accepted.set()
+        elif kind == "websocket.send":
+            self.received += 1
+            if self._on_event is not None:
+                self._on_event(json.loads(message.get("text") or message["bytes"]), time.perf_counter())
+        elif kind == "websocket.close":
+            self._accepted.set()
+
+    async def close(self):
+        await self._inbox.put({"type": "websocket.disconnect", "code": 1000})
+        if self._task is not None:
+            await self._task
+
+
+class CompletionWatcher:
+    """Records when each job reaches a terminal event."""
+
+    def __init__(self):
+        self.finished: dict[str, tuple[str, float]] = {}  # job_id -> (outcome, perf_counter)
+        self._waiters: dict[str, asyncio.Future] = {}
+
+    def on_event(self, event: dict, received: float):
+        outcome = TERMINAL_EVENTS.get(event.get("type"))
+        job_id = event.get("job_id")
+        if outcome is None or job_id in self.finished:
+            return
+        self.finished[job_id] = (outcome, received)
+        waiter = self._waiters.pop(job_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def wait(self, job_id: str):
+        if job_id in self.finished:
+            return
+        fut = self._waiters.setdefault(job_id, asyncio.get_running_loop().create_future())
+        await fut
+
+
+class Bench:
+    def __init__(self, app, client: httpx.AsyncClient, watcher: CompletionWatcher, timeout: float):
+        self._app = app
+        self._client = client
+        self._watcher = watcher
+        self._timeout = timeout
+
+    async def submit(self, payload: dict) -> tuple[str, float, int]:
+        """POST a job, retrying while the intake queue is full. Returns (job_id, submitted_at, rejections)."""
+        submitted = time.perf_counter()
+        rejections = 0
+        while True:
+            response = await self._client.post("/api/jobs", json=payload)
+            if response.status_code != 503:
+                response.raise_for_status()
+                return response.json()["id"], submitted, rejections
+            rejections += 1
+            await asyncio.sleep(0.05)
+
+    async def run_jobs(self, payloads: list[dict]) -> dict:
+        """Submit all payloads at once and wait for every job to finish."""
+
+        async def _one(payload: dict) -> tuple[str, float, int]:
+            job_id, submitted, rejections = await self.submit(payload)
+            await self._watcher.wait(job_id)
+            return job_id, submitted, rejections
+
+        with LoopLagMonitor() as lag:
+            start = time.perf_counter()
+            try:
+                runs = await asyncio.wait_for(
+                    asyncio.gather(*(_one(p) for p in payloads)), self._timeout
+                )
+            except asyncio.TimeoutError:
+                raise SystemExit(f"Benchmark timed out after {self._timeout:g}s")
+            elapsed = time.perf_counter() - start
+
+        completions, failed = [], 0
+        for job_id, submitted, _ in runs:
+            outcome, finished = self._watcher.finished[job_id]
+            if outcome == "failed":
+                failed += 1
+            completions.append(finished - submitted)
+        return {
+            "jobs": len(payloads),
+            "completed": len(payloads) - failed,
+            "failed": failed,
+            "queue_rejections": sum(r for _, _, r in runs),
+            "wall_seconds": round(elapsed, 3),
+            "jobs_per_second": round(len(payloads) / elapsed, 3),
+            "time_to_completion_s": summarize(completions),
+            "event_loop_lag_ms": summarize(lag.samples, scale=1000),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    async def metrics(self) -> dict:
+        response = await self._client.get("/api/mesh/metrics")
+        response.raise_for_status()
+        return {"limits": response.json()["limits"]}
+
+
+def simple_payloads(n: int, run: str) -> list[dict]:
+    return [
+        {
+            "title": f"Blog post {i}",
+            "description": f"Write a short blog post about topic {i} ({run}).",
+            "required_skills": ["writing"],
+            "budget": 10.0,
+        }
+        for i in range(n)
+    ]
+
+
+def orchestrated_payloads(n: int, run: str) -> list[dict]:
+    return [
+        {
+            "title": f"Launch kit {i}",
+            "description": (
+                f"Write a blog post announcing product {i}, record a voiceover narration "
+                f"of it, and design a banner image ({run})."
+            ),
+            "required_skills": ["writing", "voice", "image"],
+            "budget": 50.0,
+        }
+        for i in range(n)
+    ]
+
+
+async def run_simple(bench: Bench, args, run: str) -> dict:
+    return await bench.run_jobs(simple_payloads(args.jobs, run))
+
+
+async def run_orchestrated(bench: Bench, args, run: str) -> dict:
+    return await bench.run_jobs(orchestrated_payloads(args.jobs, run))
+
+
+async def run_websocket(bench: Bench, args, run: str) -> dict:
+    """M mesh subscribers; delivery latency is sampled on the first `--sampled` of them."""
+    started_at = datetime.utcnow()
+    latencies: list[float] = []
+
+    def sample(event: dict, received: float):
+        sent = datetime.fromisoformat(event["timestamp"])
+        if sent >= started_at:
+            latencies.append((datetime.utcnow() - sent).total_seconds())
+
+    sockets = [
+        ASGIWebSocket(bench._app, "/ws/mesh", on_event=sample if i < args.sampled else None)
+        for i in range(args.subscribers)
+    ]
+    connect_start = time.perf_counter()
+    await asyncio.gather(*(ws.connect() for ws in sockets))
+    connect_seconds = time.perf_counter() - connect_start
+    before = sum(ws.received for ws in sockets)
+
+    result = await bench.run_jobs(simple_payloads(args.ws_jobs, run))
+    delivered = sum(ws.received for ws in sockets) - before
+    await asyncio.gather(*(ws.close() for ws in sockets))
+
+    return {
+        "subscribers": args.subscribers,
+        "connect_seconds": round(connect_seconds, 3),
+        "messages_delivered": delivered,
+        "messages_per_second": round(delivered / result["wall_seconds"], 1),
+        "delivery_latency_ms": summarize(latencies, scale=1000),
+        **result,
+    }
+
+
+RUNNERS = {
+    "simple": run_simple,
+    "orchestrated": run_orchestrated,
+    "websocket": run_websocket,
+}
+
+
+async def run(args) -> dict:
+    # Imported here so configure_environment() has set up settings first
+    from backend.main import app
+
+    watcher = CompletionWatcher()
+    results = {"environment": environment_info(), "config": vars(args), "scenarios": {}}
+    run_id = f"run {time.time_ns()}"  # keeps descriptions unique across runs, defeating caches
+
+    async with app.router.lifespan_context(app):
+        observer = ASGIWebSocket(app, "/ws/mesh", on_event=watcher.on_event)
+        await observer.connect()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            bench = Bench(app, client, watcher, args.timeout)
+            for name in args.scenarios:
+                print(f"Running {name}...", flush=True)
+                scenario = await RUNNERS[name](bench, args, run_id)
+                scenario["metrics"] = await bench.metrics()
+                results["scenarios"][name] = scenario
+        await observer.close()
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--jobs", type=int, default=20, help="concurrent jobs for simple/orchestrated")
+    parser.add_argument("--subscribers", type=int, default=200, help="WebSocket subscribers")
+    parser.add_argument("--ws-jobs", type=int, default=10, help="jobs run while subscribers listen")
+    parser.add_argument("--sampled", type=int, default=10, help="subscribers that record delivery latency")
+    parser.add_argument("--seed", type=int, default=0, help="seed for simulated latency and errors")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="multiply simulated provider latencies (e.g. 0.1 for a quick run)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="per-scenario timeout in seconds")
+    parser.add_argument("-o", "--output", help="results file (default: backend/benchmarks/results/)")
+    args = parser.parse_args(argv)
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    # Database, simulated images and audio all land in the workdir; don't leave them behind
+    workdir = configure_environment(args.seed, args.latency_scale)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        remove_workdir(workdir)
+    path = write_results(results, args.output, "pipeline")
+    print(json.dumps(results["scenarios"], indent=2))
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
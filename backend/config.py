@@ -14,6 +14,9 @@ class Settings(BaseSettings):
     # Mistral model defaults
     mistral_medium_model: str = "mistral-medium-latest"
     mistral_large_model: str = "mistral-large-latest"
+    mistral_small_model: str = "mistral-small-latest"
+    # Tiers tried in order while a model's circuit is open; defaults to large, medium, small
+    mistral_fallback_chain: list[str] | None = None
 
     # ElevenLabs defaults
     elevenlabs_voice_id: str = "JBFqnCBsd6RMkjVDRZzb"  # George
@@ -23,6 +26,167 @@ class Settings(BaseSettings):
     hf_image_model: str = "black-forest-labs/FLUX.1-schnell"
     hf_embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
 
+    # Orchestrator decomposition cache (LRU + TTL; set a directory to keep entries across
+    # restarts, capped at disk max bytes with the oldest files deleted first)
+    decomposition_cache_size: int = 256
+    decomposition_cache_ttl_seconds: float = 3600.0
+    decomposition_cache_dir: str | None = None
+    decomposition_cache_disk_max_bytes: int = 64 * 1024 * 1024
+
+    # Mistral response cache (opt-in): identical (model, system prompt, messages)
+    # requests are answered from an LRU bounded by entries and bytes; set a
+    # directory to keep entries across restarts (capped at disk max bytes).
+    mistral_cache_enabled: bool = False
+    mistral_cache_max_entries: int = 2048
+    mistral_cache_max_bytes: int = 32 * 1024 * 1024
+    mistral_cache_ttl_seconds: float = 86400.0
+    mistral_cache_dir: str | None = None
+    mistral_cache_disk_max_bytes: int = 256 * 1024 * 1024
+
+    # Generated files are served from deliverables_dir (default
+    # backend/static/deliverables). Media caches keep content-addressed files in
+    # media_cache_dir (default backend/static/cache) and hard-link them into the
+    # deliverables directory, so evicting a cache entry never breaks a stored
+    # job's deliverable link.
+    deliverables_dir: str | None = None
+    media_cache_dir: str | None = None
+
+    # TTS audio cache: the least recently used narrations are deleted beyond the byte cap.
+    tts_cache_enabled: bool = True
+    tts_cache_max_bytes: int = 256 * 1024 * 1024
+
+    # Image cache: keyed by model, prompt and parameters, LRU-evicted beyond the cap.
+    image_cache_enabled: bool = True
+    image_cache_max_bytes: int = 512 * 1024 * 1024
+
+    # Per-model circuit breakers: open when, over the last `window` calls (at least
+    # min calls), the error rate or the share slower than the latency SLO reaches
+    # its threshold; after open seconds a single probe decides whether to close.
+    breaker_window: int = 20
+    breaker_min_calls: int = 5
+    breaker_error_rate: float = 0.5
+    breaker_slow_rate: float = 0.5
+    breaker_latency_slo_seconds: float = 30.0
+    breaker_open_seconds: float = 30.0
+
+    # Embeddings: texts requested within the window are sent as one batch (up to
+    # batch size); vectors are cached by text hash, and saved to / memory-mapped
+    # from the directory if set.
+    embedding_batch_size: int = 32
+    embedding_batch_window_ms: int = 10
+    embedding_cache_dir: str | None = None
+
+    # Token streaming to job WebSocket subscribers: deltas are coalesced and
+    # flushed at most every interval, or sooner once the buffer reaches max chars.
+    stream_delta_interval_ms: int = 100
+    stream_delta_max_chars: int = 512
+
+    # Pipelined handoffs: a voice subtask fed by a writer starts while the writer
+    # is still generating, narrating the text in sentence chunks of at least
+    # min chars, with up to `concurrency` chunks polished/synthesized at once.
+    pipeline_handoffs: bool = True
+    voice_chunk_min_chars: int = 200
+    voice_chunk_concurrency: int = 3
+
+    # Agent capacity: concurrent subtask slots per agent, and how long work may
+    # wait in the per-skill queue for a free slot before the subtask fails.
+    agent_max_concurrency: int = 2
+    agent_slot_wait_seconds: float = 120.0
+
+    # Subtask retries: transient provider errors are retried with full-jitter
+    # exponential backoff. Text skills (writing, code) are hedged: once a call
+    # outlasts the skill's p95 latency (after min samples) without streaming any
+    # output, a duplicate runs on a free slot and the first answer wins.
+    # retry_policies overrides per skill, e.g. {"voice": {"max_attempts": 2}}.
+    retry_max_attempts: int = 3
+    retry_base_delay_seconds: float = 0.5
+    retry_max_delay_seconds: float = 8.0
+    hedge_text_skills: bool = True
+    hedge_min_samples: int = 20
+    retry_policies: dict[str, dict] = {}
+
+    # Agent selection: least_outstanding | ewma_latency | p2c
+    agent_selection_policy: str = "least_outstanding"
+    agent_latency_ewma_alpha: float = 0.3
+
+    # Semantic agent matching: at dispatch, rank same-skill agents by how well their
+    # description fits the subtask, blended with rating and current load. Dispatch
+    # never waits on embeddings: until the subtask's vector (prefetched at planning)
+    # is cached, it falls back to the selection policy.
+    semantic_matching: bool = True
+    match_similarity_weight: float = 0.6
+    match_rating_weight: float = 0.2
+    match_load_weight: float = 0.2
+    match_retry_seconds: float = 60.0  # pause after an embedding failure
+
+    # Skill detection for jobs submitted without required_skills: cosine similarity
+    # to per-skill prototype phrases, with keyword matching as the fallback.
+    skill_classifier_enabled: bool = True
+    skill_match_threshold: float = 0.35
+    skill_min_confidence: float = 0.45
+    skill_classifier_timeout_seconds: float = 1.0
+    skill_classifier_retry_seconds: float = 60.0  # pause after an embedding failure
+
+    # Job intake: bounded queue drained by a fixed pool of job workers.
+    job_queue_size: int = 100
+    job_workers: int = 8
+
+    # Job persistence: write-behind flush interval, and how many finished jobs
+    # stay in memory (older ones are served from the database).
+    job_flush_interval_ms: int = 250
+    job_memory_limit: int = 500
+
+    # Provider adapters: blocking work (file writes) runs in a bounded thread pool.
+    provider_thread_pool_size: int = 8
+
+    # Adaptive provider limits: a token bucket (requests/second, burst) plus an
+    # AIMD concurrency window that starts at max concurrency, is cut by the
+    # decrease factor on 429/503 or a latency spike (spike factor x average),
+    # and grows back on success. HuggingFace embeddings (short, cheap calls on the
+    # matching and classification paths) get their own limits apart from images.
+    mistral_rps: float = 5.0
+    mistral_burst: int = 10
+    mistral_max_concurrency: int = 8
+    elevenlabs_rps: float = 2.0
+    elevenlabs_burst: int = 4
+    elevenlabs_max_concurrency: int = 4
+    hf_rps: float = 2.0
+    hf_burst: int = 4
+    hf_max_concurrency: int = 2
+    hf_embedding_rps: float = 10.0
+    hf_embedding_burst: int = 20
+    hf_embedding_max_concurrency: int = 4
+    limiter_min_concurrency: int = 1
+    limiter_decrease_factor: float = 0.5
+    limiter_latency_spike_factor: float = 3.0
+
+    # Provider HTTP transport: one pooled client per provider host, shared by the
+    # SDKs. HTTP/2 is used only if the h2 package is installed. Hosts with an API
+    # key configured are warmed up at startup.
+    provider_http2: bool = True
+    provider_max_connections: int = 20
+    provider_max_keepalive_connections: int = 10
+    provider_keepalive_expiry_seconds: float = 60.0
+    provider_connect_timeout_seconds: float = 10.0
+    provider_read_timeout_seconds: float = 120.0
+    provider_pool_timeout_seconds: float = 30.0
+    provider_warmup_timeout_seconds: float = 5.0
+
+    # Provider simulation: swap Mistral, ElevenLabs and HuggingFace for in-process
+    # fakes (see backend/services/simulation.py) to load-test without keys or credits.
+    # Latencies are log-normal around the given medians; sim_error_rate of calls
+    # fail with a 503.
+    simulate_providers: bool = False
+    sim_seed: int | None = None
+    sim_latency_sigma: float = 0.5
+    sim_error_rate: float = 0.0
+    sim_mistral_first_token_ms: float = 400.0
+    sim_mistral_tokens_per_second: float = 60.0
+    sim_mistral_response_tokens: int = 150
+    sim_elevenlabs_latency_ms: float = 900.0
+    sim_hf_image_latency_ms: float = 2500.0
+    sim_hf_embedding_latency_ms: float = 60.0
+
     # Networking / CORS
     # Accept either a comma-separated string or a JSON list in ALLOWED_ORIGINS.
     allowed_origins: str | list[str] = "http://localhost:5173"
@@ -0,0 +1,142 @@
+"""Job persistence — write-behind buffer from in-memory jobs to JobRecord rows."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from backend.config import get_settings
+from backend.db.database import async_session
+from backend.db.models import JobRecord
+from backend.protocol.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+def job_to_record(job: Job) -> JobRecord:
+    data = job.model_dump(mode="json")
+    return JobRecord(
+        id=job.id,
+        title=job.title,
+        description=job.description,
+        required_skills=data["required_skills"],
+        model_overrides=data["model_overrides"],
+        status=job.status.value,
+        client_name=job.client_name,
+        budget=job.budget,
+        rating=job.rating,
+        assigned_agent_id=job.assigned_agent_id,
+        deliverables=data["deliverables"],
+        subtasks=data["subtasks"],
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+    )
+
+
+def record_to_job(record: JobRecord) -> Job:
+    return Job.model_validate({
+        "id": record.id,
+        "title": record.title,
+        "description": record.description or "",
+        "required_skills": record.required_skills or [],
+        "model_overrides": record.model_overrides or {},
+        "status": record.status or JobStatus.PENDING.value,
+        "client_name": record.client_name or "Anonymous",
+        "budget": record.budget or 0.0,
+        "rating": record.rating,
+        "assigned_agent_id": record.assigned_agent_id,
+        "deliverables": record.deliverables or [],
+        "subtasks": record.subtasks or [],
+        "created_at": record.created_at,
+        "completed_at": record.completed_at,
+    })
+
+
+class JobStore:
+    """Buffers job state changes and writes them in one batched transaction per interval.
+
+    Callers mark a job dirty on every transition; only the latest state of each job
+    is written when the buffer flushes, so the write rate is bounded by the flush
+    interval rather than by the number of mesh events.
+    """
+
+    def __init__(self, flush_interval_ms: int = 250):
+        self._interval = flush_interval_ms / 1000
+        self._dirty: dict[str, Job] = {}
+        self._flusher: asyncio.Task | None = None
+
+    def mark_dirty(self, job: Job):
+        self._dirty[job.id] = job
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self._dirty:
+            await asyncio.sleep(self._interval)
+            await self.flush()
+
+    async def flush(self):
+        """Write every buffered job in a single transaction."""
+        if not self._dirty:
+            return
+        batch, self._dirty = self._dirty, {}
+        # Snapshot before the first await so the rows reflect one consistent moment
+        records = [job_to_record(job) for job in batch.values()]
+        try:
+            async with async_session() as session:
+                async with session.begin():
+                    for record in records:
+                        await session.merge(record)
+        except Exception:
+            logger.exception("Failed to persist %d job(s); will retry", len(records))
+            # Keep newer marks made during the failed write
+            self._dirty = {**batch, **self._dirty}
+
+    async def stop(self):
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        await self.flush()
+
+    async def load(self, job_id: str) -> Job | None:
+        if job_id in self._dirty:
+            return self._dirty[job_id]
+        async with async_session() as session:
+            record = await session.get(JobRecord, job_id)
+            return record_to_job(record) if record else None
+
+    async def load_unfinished(self) -> list[Job]:
+        """Jobs that never reached a terminal status, oldest first."""
+        finished = (JobStatus.COMPLETED.value, JobStatus.FAILED.value)
+        async with async_session() as session:
+            result = await session.execute(
+                select(JobRecord)
+                .where(JobRecord.status.not_in(finished))
+                .order_by(JobRecord.created_at)
+            )
+            return [record_to_job(r) for r in result.scalars().all()]
+
+    async def load_page(self, limit: int, offset: int = 0) -> list[Job]:
+        """One page of jobs, newest first, paged by created_at in SQL."""
+        await self.flush()  # so jobs still in the buffer get their place in the order
+        async with async_session() as session:
+            result = await session.execute(
+                select(JobRecord)
+                .order_by(JobRecord.created_at.desc(), JobRecord.id)
+                .offset(offset)
+                .limit(limit)
+            )
+            jobs = [record_to_job(r) for r in result.scalars().all()]
+        return [self._dirty.get(job.id, job) for job in jobs]
+
+
+_store: JobStore | None = None
+
+
+def get_job_store() -> JobStore:
+    global _store
+    if _store is None:
+        _store = JobStore(flush_interval_ms=get_settings().job_flush_interval_ms)
+    return _store
@@ -44,6 +44,7 @@ class JobRecord(Base):
     title = Column(String, nullable=False)
     description = Column(Text, default="")
     required_skills = Column(JSON, default=list)
+    model_overrides = Column(JSON, default=dict)
     status = Column(String, default="pending")
     client_name = Column(String, default="Anonymous")
     budget = Column(Float, default=0.0)
@@ -51,7 +52,7 @@ class JobRecord(Base):
     assigned_agent_id = Column(String, nullable=True)
     deliverables = Column(JSON, default=list)
     subtasks = Column(JSON, default=list)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # job list paging
     completed_at = Column(DateTime, nullable=True)
 
 
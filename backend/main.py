@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import os
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
 from typing import Annotated
 
 import jwt
@@ -19,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import get_settings
 from backend.db.database import get_db, init_db
+from backend.db.job_store import get_job_store
 from backend.db.models import UserModel
 from backend.db_login_crud import (
     create_user,
@@ -33,6 +33,10 @@ from backend.db_login_crud import (
     get_users,
 )
 from backend.db.seed import seed_agents
+from backend.protocol.router import get_router
+from backend.services.embeddings import get_embedding_service
+from backend.services.io import deliverables_dir, shutdown_executor
+from backend.services.transport import get_transport
 from backend.api import agents, jobs, mesh, ws
 
 
@@ -137,7 +141,25 @@ from contextlib import asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
     await seed_agents()
+    await get_router().start()
+    await get_router().recover_jobs()
+    transport = get_transport()  # warns here if HTTP/2 is configured but unavailable
+    if not settings.simulate_providers:
+        await transport.warm_up([
+            provider
+            for provider, key in (
+                ("mistral", settings.mistral_api_key),
+                ("elevenlabs", settings.elevenlabs_api_key),
+                ("huggingface", settings.huggingface_api_key),
+            )
+            if key
+        ])
     yield
+    await get_router().stop()
+    await get_job_store().stop()
+    await get_embedding_service().stop()
+    await get_transport().close()
+    shutdown_executor()
 
 
 app = FastAPI(
@@ -158,7 +180,7 @@ app.add_middleware(
 )
 
 # Static files for deliverables
-static_dir = Path(__file__).parent / "static" / "deliverables"
+static_dir = deliverables_dir()
 static_dir.mkdir(parents=True, exist_ok=True)
 app.mount("/static/deliverables", StaticFiles(directory=str(static_dir)), name="deliverables")
 
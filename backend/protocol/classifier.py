@@ -0,0 +1,177 @@
+"""Skill classifier — infer which skills a job needs from its description.
+
+Each skill has a handful of prototype phrases, embedded once and kept as one
+matrix. Classifying a batch of descriptions is a single (batch x dim) @
+(dim x prototypes) multiply; a skill's score is its best-matching prototype.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from backend.config import get_settings
+from backend.protocol.models import Skill
+from backend.services.embeddings import get_embedding_service
+
+logger = logging.getLogger(__name__)
+
+SKILL_PROTOTYPES: dict[Skill, list[str]] = {
+    Skill.WRITING: [
+        "Write a blog post or article",
+        "Draft marketing copy for a landing page",
+        "Write a script or a short story",
+        "Write product documentation or a user guide",
+        "Write social media posts and newsletter content",
+    ],
+    Skill.VOICE: [
+        "Record a voiceover narration",
+        "Turn this script into spoken audio",
+        "Produce a podcast episode intro",
+        "Text to speech for an audiobook",
+    ],
+    Skill.IMAGE: [
+        "Design a logo",
+        "Create a banner image or illustration",
+        "Generate a picture or photo for a website",
+        "Make a visual graphic or poster",
+    ],
+    Skill.CODE: [
+        "Write a Python function",
+        "Build a web app or REST API",
+        "Review this code and fix the bugs",
+        "Develop a software program or script in JavaScript",
+        "Refactor and debug a backend service",
+    ],
+}
+
+WRITING_KEYWORDS = ["blog", "write", "article", "copy", "script", "content", "story", "documentation"]
+VOICE_KEYWORDS = ["voice", "audio", "narrat", "voiceover", "speak", "podcast", "tts"]
+IMAGE_KEYWORDS = ["image", "logo", "banner", "illustration", "design", "visual", "picture", "photo", "graphic"]
+CODE_KEYWORDS = ["code", "develop", "program", "function", "api", "app", "software", "debug"]
+
+
+def detect_skills_by_keyword(description: str) -> list[Skill]:
+    """Simple keyword-based skill detection as a fallback."""
+    desc_lower = description.lower()
+    skills = []
+
+    if any(kw in desc_lower for kw in WRITING_KEYWORDS):
+        skills.append(Skill.WRITING)
+    if any(kw in desc_lower for kw in VOICE_KEYWORDS):
+        skills.append(Skill.VOICE)
+    if any(kw in desc_lower for kw in IMAGE_KEYWORDS):
+        skills.append(Skill.IMAGE)
+    if any(kw in desc_lower for kw in CODE_KEYWORDS):
+        skills.append(Skill.CODE)
+
+    return skills or [Skill.WRITING]  # default to writing
+
+
+class SkillClassifier:
+    """Scores descriptions against per-skill prototype embeddings.
+
+    The classifier is trusted for a description when its best skill scores at
+    least `min_confidence`; every skill scoring `threshold` or more is then
+    detected, so secondary skills can clear a lower bar. Descriptions below
+    `min_confidence`, and batches whose embeddings fail or take longer than
+    `timeout`, fall back to keyword detection.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.35,
+        min_confidence: float = 0.45,
+        timeout: float = 1.0,
+        retry_seconds: float = 60.0,
+    ):
+        self._threshold = threshold
+        self._min_confidence = min_confidence
+        self._timeout = timeout
+        self._retry_seconds = retry_seconds
+        self._disabled_until = 0.0
+        self._skills = list(SKILL_PROTOTYPES)
+        # Prototype rows are grouped by skill; _starts marks where each group begins
+        sizes = [len(SKILL_PROTOTYPES[s]) for s in self._skills]
+        self._starts = np.cumsum([0] + sizes[:-1])
+        self._prototypes: np.ndarray | None = None  # (dim, prototypes), ready for Q @ P
+        self._build_lock = asyncio.Lock()
+        self.classified = 0
+        self.fallbacks = 0
+
+    async def _prototype_matrix(self) -> np.ndarray:
+        if self._prototypes is None:
+            async with self._build_lock:
+                if self._prototypes is None:
+                    texts = [t for skill in self._skills for t in SKILL_PROTOTYPES[skill]]
+                    self._prototypes = np.ascontiguousarray(
+                        (await get_embedding_service().embed(texts)).T
+                    )
+        return self._prototypes
+
+    def scores(self, queries: np.ndarray, prototypes: np.ndarray) -> np.ndarray:
+        """(batch, skills) score matrix: each skill's best prototype similarity."""
+        return np.maximum.reduceat(queries @ prototypes, self._starts, axis=1)
+
+    async def classify(self, descriptions: list[str]) -> list[list[Skill]]:
+        """Skills for each description, in order."""
+        if not descriptions:
+            return []
+        if time.monotonic() < self._disabled_until:
+            return self._fallback(descriptions)
+
+        async def _embed() -> tuple[np.ndarray, np.ndarray]:
+            prototypes = await self._prototype_matrix()
+            return await get_embedding_service().embed(descriptions), prototypes
+
+        try:
+            queries, prototypes = await asyncio.wait_for(asyncio.shield(_embed()), self._timeout)
+        except asyncio.TimeoutError:
+            return self._fallback(descriptions)
+        except Exception as e:
+            logger.warning("Skill classifier paused for %gs: %s", self._retry_seconds, e)
+            self._disabled_until = time.monotonic() + self._retry_seconds
+            return self._fallback(descriptions)
+
+        scores = self.scores(queries, prototypes)
+        detected = scores >= self._threshold
+        confident = scores.max(axis=1) >= self._min_confidence
+        results = []
+        for description, row, ok in zip(descriptions, detected, confident):
+            if ok:
+                self.classified += 1
+                results.append([self._skills[i] for i in np.flatnonzero(row)])
+            else:
+                self.fallbacks += 1
+                results.append(detect_skills_by_keyword(description))
+        return results
+
+    def _fallback(self, descriptions: list[str]) -> list[list[Skill]]:
+        self.fallbacks += len(descriptions)
+        return [detect_skills_by_keyword(d) for d in descriptions]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": time.monotonic() >= self._disabled_until,
+            "classified": self.classified,
+            "fallbacks": self.fallbacks,
+        }
+
+
+_classifier: SkillClassifier | None = None
+
+
+def get_skill_classifier() -> SkillClassifier:
+    global _classifier
+    if _classifier is None:
+        s = get_settings()
+        _classifier = SkillClassifier(
+            threshold=s.skill_match_threshold,
+            min_confidence=s.skill_min_confidence,
+            timeout=s.skill_classifier_timeout_seconds,
+            retry_seconds=s.skill_classifier_retry_seconds,
+        )
+    return _classifier
@@ -0,0 +1,163 @@
+"""Semantic agent matching — rank candidates by how well their description fits a subtask.
+
+Agent descriptions are embedded once, when the agent registers, into a
+VectorIndex. The subtask text is embedded when the subtask is planned, so at
+dispatch ranking never waits on the network: it reads the cached vector and
+scores every candidate with a single matrix-vector multiply.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable
+
+import numpy as np
+
+from backend.config import get_settings
+from backend.protocol.models import AgentProfile
+from backend.services.embeddings import VectorIndex, get_embedding_service
+
+logger = logging.getLogger(__name__)
+
+
+def profile_text(profile: AgentProfile) -> str:
+    return f"{profile.role}: {profile.description}"
+
+
+class AgentMatcher:
+    """Blends description similarity with rating and load to order candidate agents.
+
+    score = similarity_weight * cosine(subtask, agent)
+          + rating_weight * rating / 5
+          - load_weight * outstanding / capacity
+
+    Ranking gives up (returns None) when the subtask or a candidate has no
+    cached embedding yet, so callers fall back to their load-only policy; the
+    missing embeddings are then fetched in the background for next time. After
+    an embedding failure, matching stays off for `retry_seconds`.
+    """
+
+    def __init__(
+        self,
+        similarity_weight: float = 0.6,
+        rating_weight: float = 0.2,
+        load_weight: float = 0.2,
+        retry_seconds: float = 60.0,
+    ):
+        self._index = VectorIndex()
+        self._texts: dict[str, str] = {}  # agent_id -> text its vector was built from
+        self._weights = np.array([similarity_weight, rating_weight, -load_weight], dtype=np.float32)
+        self._retry_seconds = retry_seconds
+        self._disabled_until = 0.0
+        self._tasks: set[asyncio.Task] = set()
+        self.ranked = 0
+        self.fallbacks = 0
+
+    def add(self, profile: AgentProfile):
+        """Start embedding a newly registered agent's description in the background."""
+        self._spawn(self.index([profile]))
+
+    def remove(self, agent_id: str):
+        self._index.remove(agent_id)
+        self._texts.pop(agent_id, None)
+
+    def prefetch(self, text: str):
+        """Warm the embedding cache for a subtask that will be dispatched later."""
+        self._spawn(get_embedding_service().embed_one(text))
+
+    def _spawn(self, coro):
+        if not self.enabled:
+            coro.close()
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:  # no loop yet; indexed lazily on first rank
+            coro.close()
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self._disable(task.exception())
+
+    @property
+    def enabled(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    def _disable(self, error: BaseException):
+        if self.enabled:
+            logger.warning("Semantic agent matching paused for %gs: %s", self._retry_seconds, error)
+        self._disabled_until = time.monotonic() + self._retry_seconds
+
+    async def index(self, profiles: list[AgentProfile]):
+        """Embed the descriptions of agents that aren't indexed yet (or have changed) in one batch."""
+        stale = [p for p in profiles if self._texts.get(p.id) != profile_text(p)]
+        if not stale:
+            return
+        texts = [profile_text(p) for p in stale]
+        vectors = await get_embedding_service().embed(texts)
+        for profile, text, vector in zip(stale, texts, vectors):
+            self._index.set(profile.id, vector)
+            self._texts[profile.id] = text
+
+    def rank(
+        self,
+        candidates: list[AgentProfile],
+        text: str,
+        load: Callable[[AgentProfile], float],
+    ) -> list[AgentProfile] | None:
+        """Candidates best first, or None if semantic scores aren't cached yet.
+
+        `load` maps an agent to its utilisation in [0, 1]. Never waits on an
+        embedding request.
+        """
+        if not self.enabled:
+            self.fallbacks += 1
+            return None
+
+        query = get_embedding_service().cached(text)
+        stale = [p for p in candidates if self._texts.get(p.id) != profile_text(p)]
+        if query is None or stale:
+            # Fill the cache in the background so the next dispatch can rank
+            if stale:
+                self._spawn(self.index(stale))
+            if query is None:
+                self.prefetch(text)
+            self.fallbacks += 1
+            return None
+
+        features = np.empty((len(candidates), 3), dtype=np.float32)
+        features[:, 0] = self._index.scores(query, [p.id for p in candidates])
+        features[:, 1] = [p.rating / 5 for p in candidates]
+        features[:, 2] = [min(1.0, load(p)) for p in candidates]
+        order = np.argsort(-(features @ self._weights), kind="stable")
+        self.ranked += 1
+        return [candidates[i] for i in order]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "indexed_agents": len(self._index),
+            "ranked": self.ranked,
+            "fallbacks": self.fallbacks,
+        }
+
+
+_matcher: AgentMatcher | None = None
+
+
+def get_agent_matcher() -> AgentMatcher:
+    global _matcher
+    if _matcher is None:
+        s = get_settings()
+        _matcher = AgentMatcher(
+            similarity_weight=s.match_similarity_weight,
+            rating_weight=s.match_rating_weight,
+            load_weight=s.match_load_weight,
+            retry_seconds=s.match_retry_seconds,
+        )
+    return _matcher
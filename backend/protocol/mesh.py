@@ -85,6 +85,21 @@ class MeshNetwork:
         for ws in dead:
             self.unsubscribe_mesh(ws)
 
+    async def broadcast_job(self, event: MeshEvent):
+        """Send a high-frequency event to a job's subscribers without recording it in history."""
+        subscribers = self._job_subscribers.get(event.job_id)
+        if not subscribers:
+            return
+        payload = json.loads(event.model_dump_json())
+        dead = []
+        for ws in subscribers:
+            try:
+                await ws.send_json(payload)
+            except Exception:
+                dead.append(ws)
+        for ws in dead:
+            self.unsubscribe_job(event.job_id, ws)
+
     def get_events(self, job_id: str | None = None, limit: int = 100) -> list[MeshEvent]:
         events = self._events
         if job_id:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import random
 import uuid
 from datetime import datetime
 from enum import Enum
@@ -53,9 +54,12 @@ class MeshEventType(str, Enum):
     AGENT_REGISTERED = "agent_registered"
     AGENT_STATUS_CHANGED = "agent_status_changed"
     JOB_CREATED = "job_created"
+    JOB_RESUMED = "job_resumed"
     JOB_DECOMPOSED = "job_decomposed"
     SUBTASK_ASSIGNED = "subtask_assigned"
     SUBTASK_STARTED = "subtask_started"
+    SUBTASK_DELTA = "subtask_delta"  # streamed output chunk; sent to job subscribers only, not kept in history
+    SUBTASK_RETRYING = "subtask_retrying"
     SUBTASK_COMPLETED = "subtask_completed"
     SUBTASK_FAILED = "subtask_failed"
     HANDOFF = "handoff"
@@ -65,6 +69,20 @@ class MeshEventType(str, Enum):
 
 # --- Agent Models ---
 
+class RetryPolicy(BaseModel):
+    """How a failed subtask execution is retried, and whether slow ones are hedged."""
+    max_attempts: int = Field(default=3, ge=1)
+    base_delay: float = Field(default=0.5, ge=0)  # seconds before the first retry, doubled each time
+    max_delay: float = Field(default=8.0, ge=0)
+    hedge: bool = False  # fire a duplicate once a call outlasts the skill's hedge percentile
+    hedge_percentile: float = Field(default=0.95, gt=0, lt=1)
+
+    def backoff(self, attempt: int, rng: random.Random | None = None) -> float:
+        """Full-jitter exponential delay before retry number `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return (rng or random).uniform(0, ceiling)
+
+
 class AgentProfile(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -76,6 +94,8 @@ class AgentProfile(BaseModel):
     rating: float = 5.0
     jobs_completed: int = 0
     status: AgentStatus = AgentStatus.AVAILABLE
+    max_concurrency: int | None = Field(default=None, ge=1)  # concurrent subtask slots; None = settings default
+    retry_policy: RetryPolicy | None = None  # None = the skill's policy from settings
     handoff_targets: list[str] = Field(default_factory=list)  # agent IDs this agent can hand off to
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -128,6 +148,7 @@ class Job(BaseModel):
     client_name: str = "Anonymous"
     model_overrides: dict[Skill, str] = Field(default_factory=dict)
     status: JobStatus = JobStatus.PENDING
+    queue_position: int | None = None  # 1-based position in the intake queue while waiting for a worker
     assigned_agent_id: str | None = None
     subtasks: list[SubTask] = Field(default_factory=list)
     deliverables: list[Deliverable] = Field(default_factory=list)
@@ -1,23 +1,69 @@
-"""Agent Registry — in-memory agent registration and skill-based discovery."""
+"""Agent Registry — in-memory agent registration, skill-based discovery, and concurrency slots."""
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+from collections import defaultdict, deque
+from typing import Any, Callable, Iterator
+
 from backend.agents.base import BaseAgent
+from backend.config import get_settings
+from backend.protocol.matching import get_agent_matcher
 from backend.protocol.models import AgentProfile, AgentStatus, Skill
 
 
 class AgentRegistry:
-    """Manages agent profiles and their associated runtime instances."""
+    """Manages agent profiles and their associated runtime instances.
+
+    A skill index (skill -> routable agents) is maintained incrementally on
+    register, set_status and deregister, so skill lookups never scan every profile.
+
+    Each agent has a fixed number of concurrent slots. Work that arrives while every
+    agent for a skill is at capacity waits in a per-skill FIFO queue until a slot is
+    released, instead of being rejected.
+    """
 
     def __init__(self):
         self._profiles: dict[str, AgentProfile] = {}
         self._instances: dict[str, BaseAgent] = {}  # agent_id -> runtime instance
+        self._active: dict[str, int] = {}  # agent_id -> occupied slots
+        self._waiters: dict[Skill, deque[tuple[asyncio.Future, str | None]]] = defaultdict(deque)
+        # skill -> {agent_id: profile} for agents that aren't OFFLINE, in registration order
+        self._by_skill: dict[Skill, dict[str, AgentProfile]] = defaultdict(dict)
 
     def register(self, profile: AgentProfile, instance: BaseAgent) -> AgentProfile:
+        if profile.id in self._profiles:
+            self._unindex(self._profiles[profile.id])
         self._profiles[profile.id] = profile
         self._instances[profile.id] = instance
+        self._active.setdefault(profile.id, 0)
+        self._index(profile)
+        if get_settings().semantic_matching:
+            get_agent_matcher().add(profile)
+        self._serve_waiters(profile)
+        return profile
+
+    def deregister(self, agent_id: str) -> AgentProfile | None:
+        profile = self._profiles.pop(agent_id, None)
+        if profile is None:
+            return None
+        self._unindex(profile)
+        self._instances.pop(agent_id, None)
+        self._active.pop(agent_id, None)
+        get_agent_matcher().remove(agent_id)
         return profile
 
+    def _index(self, profile: AgentProfile):
+        if profile.status == AgentStatus.OFFLINE:
+            return
+        for skill in profile.skills:
+            self._by_skill[skill][profile.id] = profile
+
+    def _unindex(self, profile: AgentProfile):
+        for skill in profile.skills:
+            self._by_skill[skill].pop(profile.id, None)
+
     def get_profile(self, agent_id: str) -> AgentProfile | None:
         return self._profiles.get(agent_id)
 
@@ -28,20 +74,49 @@ class AgentRegistry:
         return list(self._profiles.values())
 
     def find_by_skill(self, skill: Skill) -> list[AgentProfile]:
-        return [
-            p for p in self._profiles.values()
-            if skill in p.skills and p.status == AgentStatus.AVAILABLE
-        ]
+        """Agents that can take work for a skill. Busy agents are included — callers queue for a slot."""
+        return list(self._by_skill[skill].values())
 
     def find_by_skills(self, skills: list[Skill]) -> list[AgentProfile]:
-        return [
-            p for p in self._profiles.values()
-            if any(s in p.skills for s in skills) and p.status == AgentStatus.AVAILABLE
-        ]
+        found: dict[str, AgentProfile] = {}
+        for skill in skills:
+            found.update(self._by_skill[skill])
+        return list(found.values())
+
+    def has_skill(self, skill: Skill) -> bool:
+        return bool(self._by_skill[skill])
+
+    def count_by_skill(self, skill: Skill) -> int:
+        return len(self._by_skill[skill])
+
+    def iter_by_skill(
+        self,
+        skill: Skill,
+        key: Callable[[AgentProfile], Any] | None = None,
+    ) -> Iterator[AgentProfile]:
+        """Yield agents for a skill, best first.
+
+        Ranks by `key` (lower is better), defaulting to highest rating then most
+        jobs completed. Ordering is lazy, so taking the top few stays cheap.
+        """
+        if key is None:
+            key = lambda p: (-p.rating, -p.jobs_completed)
+        heap = [(key(p), i, p) for i, p in enumerate(self._by_skill[skill].values())]
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)[2]
 
     def set_status(self, agent_id: str, status: AgentStatus):
-        if agent_id in self._profiles:
-            self._profiles[agent_id].status = status
+        profile = self._profiles.get(agent_id)
+        if profile is None:
+            return
+        profile.status = status
+        if status == AgentStatus.OFFLINE:
+            self._unindex(profile)
+        else:
+            self._index(profile)
+            self._refresh_status(agent_id)
+            self._serve_waiters(profile)
 
     def get_handoff_targets(self, agent_id: str) -> list[AgentProfile]:
         profile = self._profiles.get(agent_id)
@@ -53,6 +128,133 @@ class AgentRegistry:
             if tid in self._profiles
         ]
 
+    # --- Concurrency slots ---
+
+    def capacity(self, agent_id: str) -> int:
+        profile = self._profiles.get(agent_id)
+        if not profile:
+            return 0
+        return profile.max_concurrency or get_settings().agent_max_concurrency
+
+    def _has_free_slot(self, profile: AgentProfile) -> bool:
+        return (
+            profile.status != AgentStatus.OFFLINE
+            and self._active.get(profile.id, 0) < self.capacity(profile.id)
+        )
+
+    def _take_slot(self, agent_id: str):
+        self._active[agent_id] = self._active.get(agent_id, 0) + 1
+        self._refresh_status(agent_id)
+
+    def _refresh_status(self, agent_id: str):
+        profile = self._profiles[agent_id]
+        if profile.status == AgentStatus.OFFLINE:
+            return
+        full = self._active.get(agent_id, 0) >= self.capacity(agent_id)
+        profile.status = AgentStatus.BUSY if full else AgentStatus.AVAILABLE
+
+    def try_acquire(self, skill: Skill, preferred_id: str | None = None) -> AgentProfile | None:
+        """Take a slot immediately if one is free and nobody is already queued for the skill."""
+        if any(not fut.done() for fut, _ in self._waiters[skill]):
+            return None
+        return self._grant(skill, preferred_id)
+
+    def _grant(self, skill: Skill, preferred_id: str | None) -> AgentProfile | None:
+        preferred = self._profiles.get(preferred_id) if preferred_id else None
+        if preferred and skill in preferred.skills and self._has_free_slot(preferred):
+            self._take_slot(preferred.id)
+            return preferred
+        for profile in self.find_by_skill(skill):
+            if self._has_free_slot(profile):
+                self._take_slot(profile.id)
+                return profile
+        return None
+
+    async def acquire(
+        self,
+        skill: Skill,
+        preferred_id: str | None = None,
+        timeout: float | None = None,
+    ) -> AgentProfile:
+        """Take a slot on an agent with the skill, preferring `preferred_id`.
+
+        Waits in the skill's FIFO queue when every agent is at capacity. Raises
+        TimeoutError if no slot frees up within `timeout` seconds.
+        """
+        profile = self.try_acquire(skill, preferred_id)
+        if profile:
+            return profile
+
+        fut: asyncio.Future[AgentProfile] = asyncio.get_running_loop().create_future()
+        self._waiters[skill].append((fut, preferred_id))
+        if timeout is None:
+            timeout = get_settings().agent_slot_wait_seconds
+        try:
+            await asyncio.wait({fut}, timeout=timeout)
+        except asyncio.CancelledError:
+            # A slot granted in the same tick we were cancelled must be handed back.
+            if fut.done():
+                self.release(fut.result().id)
+            else:
+                fut.cancel()
+            self._prune(skill)
+            raise
+        if not fut.done():
+            fut.cancel()
+            self._prune(skill)
+            raise TimeoutError(f"No {skill.value} agent slot freed up within {timeout:g}s")
+        return fut.result()
+
+    def release(self, agent_id: str):
+        """Free a slot and hand it to the longest-waiting request for any of the agent's skills."""
+        if self._active.get(agent_id, 0) > 0:
+            self._active[agent_id] -= 1
+        profile = self._profiles.get(agent_id)
+        if not profile:
+            return
+        self._serve_waiters(profile)
+        self._refresh_status(agent_id)
+
+    def _serve_waiters(self, profile: AgentProfile):
+        """Hand the agent's free slots to the longest-waiting requests for its skills.
+
+        Called whenever slots may have opened up: on release, on registration,
+        and when an agent comes back from OFFLINE.
+        """
+        for skill in profile.skills:
+            queue = self._waiters[skill]
+            while queue and self._has_free_slot(profile):
+                fut, preferred_id = queue.popleft()
+                if fut.done():
+                    continue
+                granted = self._grant(skill, preferred_id)
+                if granted is None:
+                    queue.appendleft((fut, preferred_id))
+                    break
+                fut.set_result(granted)
+
+    def _prune(self, skill: Skill):
+        queue = self._waiters[skill]
+        self._waiters[skill] = deque(w for w in queue if not w[0].done())
+
+    def slot_stats(self) -> dict:
+        """Slot occupancy per agent and queue depth per skill."""
+        return {
+            "agents": [
+                {
+                    "id": p.id,
+                    "name": p.name,
+                    "active": self._active.get(p.id, 0),
+                    "capacity": self.capacity(p.id),
+                }
+                for p in self._profiles.values()
+            ],
+            "queue_depth": {
+                skill.value: sum(1 for fut, _ in queue if not fut.done())
+                for skill, queue in self._waiters.items()
+            },
+        }
+
 
 # Singleton
 _registry: AgentRegistry | None = None
@@ -0,0 +1,58 @@
+"""Retry and hedging support for subtask execution."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+
+import httpx
+
+from backend.config import get_settings
+from backend.protocol.models import AgentProfile, RetryPolicy, Skill
+from backend.services.limiter import provider_status
+
+# Provider responses worth another try; other 4xx mean the request itself is wrong
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Skills whose calls are plain text generation, hedged by default
+TEXT_SKILLS = {Skill.WRITING, Skill.CODE}
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    return provider_status(exc) in TRANSIENT_STATUSES
+
+
+def resolve_retry_policy(profile: AgentProfile | None, skill: Skill) -> RetryPolicy:
+    """The agent's own policy if it has one, else the skill's policy from settings."""
+    if profile is not None and profile.retry_policy is not None:
+        return profile.retry_policy
+    settings = get_settings()
+    policy = RetryPolicy(
+        max_attempts=settings.retry_max_attempts,
+        base_delay=settings.retry_base_delay_seconds,
+        max_delay=settings.retry_max_delay_seconds,
+        hedge=settings.hedge_text_skills and skill in TEXT_SKILLS,
+    )
+    override = settings.retry_policies.get(skill.value)
+    return RetryPolicy.model_validate({**policy.model_dump(), **override}) if override else policy
+
+
+class LatencyTracker:
+    """Sliding window of successful execution latencies per skill."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: dict[Skill, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._min_samples = min_samples
+
+    def record(self, skill: Skill, seconds: float):
+        self._samples[skill].append(seconds)
+
+    def percentile(self, skill: Skill, q: float) -> float | None:
+        """Latency at quantile `q`, or None until there are enough samples."""
+        samples = self._samples.get(skill)
+        if not samples or len(samples) < self._min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
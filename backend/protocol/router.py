@@ -3,55 +3,301 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import deque
 from datetime import datetime
 
+from backend.agents.base import BaseAgent
+from backend.config import get_settings
+from backend.db.job_store import get_job_store
 from backend.protocol.models import (
-    AgentStatus,
+    AgentProfile,
     Deliverable,
     Job,
-    JobDecomposition,
     JobStatus,
     MeshEvent,
     MeshEventType,
+    RetryPolicy,
     Skill,
     SubTask,
     SubTaskStatus,
 )
+from backend.protocol.matching import get_agent_matcher
 from backend.protocol.registry import get_registry
+from backend.protocol.retry import LatencyTracker, is_transient, resolve_retry_policy
 from backend.protocol.mesh import get_mesh
+from backend.protocol.scheduler import SubtaskScheduler, critical_path_seconds
+from backend.protocol.selection import AgentStatsTracker, get_selection_policy
+from backend.protocol.streaming import DeltaCoalescer, TextStream
+from backend.services.io import deliverables_dir
+
+logger = logging.getLogger(__name__)
+
+DELIVERABLES_DIR = deliverables_dir()
+STATIC_PREFIX = "/static/deliverables/"
+
+
+def _deliverable_exists(deliverable: Deliverable | None) -> bool:
+    """True if a deliverable's content is inline, or its file is still on disk."""
+    if deliverable is None:
+        return False
+    if deliverable.content.startswith(STATIC_PREFIX):
+        return (DELIVERABLES_DIR / deliverable.content.removeprefix(STATIC_PREFIX)).is_file()
+    return True
+
+
+# (producer skill, consumer skill) pairs where the consumer may start while the
+# producer is still running, reading its output from a TextStream
+PIPELINED_HANDOFFS = {(Skill.WRITING, Skill.VOICE)}
+PIPELINE_SOURCES = {producer for producer, _ in PIPELINED_HANDOFFS}
+
+
+class JobQueueFull(Exception):
+    """Raised when the job intake queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
 
 
 class JobRouter:
-    """Routes jobs to agents, manages decomposition and execution."""
+    """Routes jobs to agents, manages decomposition and execution.
+
+    Submitted jobs go into a bounded intake queue drained by a fixed pool of
+    workers, so a burst of submissions can't fan out into unbounded provider calls.
+    """
 
     def __init__(self):
+        settings = get_settings()
         self._jobs: dict[str, Job] = {}
+        self._finished: deque[str] = deque()  # finished job IDs still held in memory, oldest first
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=settings.job_queue_size)
+        self._queued: dict[str, Job] = {}  # job_id -> job, in queue order
+        self._workers: list[asyncio.Task] = []
+        self._requeuer: asyncio.Task | None = None  # feeds recovered jobs into the queue
+        self._avg_job_seconds = 30.0  # EWMA of job run time, seeds the Retry-After estimate
+        self._stats = AgentStatsTracker(alpha=settings.agent_latency_ewma_alpha)
+        self._policy = get_selection_policy(settings.agent_selection_policy)
+        self._latencies = LatencyTracker(min_samples=settings.hedge_min_samples)  # per skill, for hedging
+
+    async def get_job(self, job_id: str) -> Job | None:
+        """Look up a job in memory, falling back to persisted jobs."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = await get_job_store().load(job_id)
+        return job
 
-    def get_job(self, job_id: str) -> Job | None:
-        return self._jobs.get(job_id)
+    async def list_jobs(self, limit: int = 50, offset: int = 0) -> list[Job]:
+        """Newest jobs first, one page at a time."""
+        jobs = await get_job_store().load_page(limit, offset)
+        return [self._jobs.get(job.id, job) for job in jobs]  # in-memory state is always the freshest
 
-    def list_jobs(self) -> list[Job]:
-        return list(self._jobs.values())
+    async def _emit(self, job: Job, event: MeshEvent):
+        """Broadcast a job event and queue the job's new state for persistence."""
+        get_job_store().mark_dirty(job)
+        await get_mesh().emit(event)
+
+    def _forget_finished(self, job: Job):
+        """Keep only the most recent finished jobs in memory; the rest live in the database."""
+        self._finished.append(job.id)
+        while len(self._finished) > get_settings().job_memory_limit:
+            self._jobs.pop(self._finished.popleft(), None)
 
     async def submit_job(self, job: Job) -> Job:
-        """Submit a job — determines if simple or complex, then routes accordingly."""
+        """Queue a job for the worker pool. Raises JobQueueFull when the queue is at capacity."""
+        if not self._workers:
+            await self.start()
+        if self._queue.full():
+            raise JobQueueFull(self.retry_after())
+
         self._jobs[job.id] = job
-        mesh = get_mesh()
+        self._queued[job.id] = job
+        job.queue_position = len(self._queued)
+        self._queue.put_nowait(job)
 
-        await mesh.emit(MeshEvent(
+        await self._emit(job, MeshEvent(
             type=MeshEventType.JOB_CREATED,
             job_id=job.id,
-            data={"title": job.title, "skills": [s.value for s in job.required_skills]},
+            data={
+                "title": job.title,
+                "skills": [s.value for s in job.required_skills],
+                "queue_position": job.queue_position,
+            },
         ))
 
-        # Determine routing strategy
-        if self._needs_orchestration(job):
-            asyncio.create_task(self._orchestrate_job(job))
-        else:
-            asyncio.create_task(self._route_simple_job(job))
-
         return job
 
+    def retry_after(self) -> int:
+        """Rough seconds until a queue slot frees up, for the Retry-After header."""
+        workers = max(len(self._workers), 1)
+        return max(1, math.ceil(self._avg_job_seconds * (len(self._queued) + 1) / workers))
+
+    def queue_stats(self) -> dict:
+        return {
+            "queued": len(self._queued),
+            "capacity": self._queue.maxsize,
+            "workers": len(self._workers),
+            "avg_job_seconds": round(self._avg_job_seconds, 3),
+        }
+
+    async def start(self):
+        """Spawn the job worker pool."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(get_settings().job_workers)
+        ]
+
+    async def stop(self):
+        # Jobs the requeuer hadn't fed in yet are still unfinished in the store
+        # and are recovered again on the next start
+        tasks = [*self._workers, *([self._requeuer] if self._requeuer else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._requeuer = None
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self._queued.pop(job.id, None)
+            job.queue_position = None
+            for position, queued in enumerate(self._queued.values(), start=1):
+                queued.queue_position = position
+
+            started = time.monotonic()
+            try:
+                await self._run_job(job)
+            except Exception as e:
+                logger.exception("Job %s crashed", job.id)
+                job.status = JobStatus.FAILED
+                await self._emit(job, MeshEvent(
+                    type=MeshEventType.JOB_FAILED,
+                    job_id=job.id,
+                    data={"error": str(e)},
+                ))
+            finally:
+                elapsed = time.monotonic() - started
+                self._avg_job_seconds = 0.8 * self._avg_job_seconds + 0.2 * elapsed
+                self._forget_finished(job)
+                self._queue.task_done()
+
+    def agent_stats(self) -> dict:
+        return {
+            "policy": self._policy.name,
+            "matching": get_agent_matcher().stats(),
+            "agents": self._stats.snapshot(),
+        }
+
+    def _select_agent(self, candidates: list[AgentProfile]) -> AgentProfile:
+        """Pick one of the candidates with the configured selection policy."""
+        return self._policy.choose(candidates, self._stats)
+
+    def _match_agent(self, candidates: list[AgentProfile], subtask: SubTask) -> AgentProfile:
+        """Pick the agent whose description best fits the subtask, weighed against rating and load.
+
+        Falls back to the selection policy when there is nothing to rank or
+        semantic scores aren't cached yet.
+        """
+        if len(candidates) > 1 and get_settings().semantic_matching:
+            registry = get_registry()
+            ranked = get_agent_matcher().rank(
+                candidates,
+                f"{subtask.title}\n{subtask.description}",
+                load=lambda p: self._stats.get(p.id).outstanding / max(registry.capacity(p.id), 1),
+            )
+            if ranked:
+                return ranked[0]
+        return self._select_agent(candidates)
+
+    def _prefetch_match(self, subtask: SubTask):
+        """Start embedding a subtask's text so matching it at dispatch is a cache hit."""
+        settings = get_settings()
+        if settings.semantic_matching and get_registry().count_by_skill(subtask.required_skill) > 1:
+            get_agent_matcher().prefetch(f"{subtask.title}\n{subtask.description}")
+
+    async def recover_jobs(self) -> int:
+        """Re-queue jobs that were still unfinished when the process last stopped.
+
+        Subtasks whose deliverable is already stored (inline text, or a file still
+        present under static/deliverables) are kept, so resuming only pays for the
+        work that didn't finish.
+        """
+        jobs = [job for job in await get_job_store().load_unfinished() if job.id not in self._jobs]
+        for job in jobs:
+            self._prepare_resume(job)
+            self._jobs[job.id] = job
+            self._queued[job.id] = job
+            job.queue_position = len(self._queued)
+            await self._emit(job, MeshEvent(
+                type=MeshEventType.JOB_RESUMED,
+                job_id=job.id,
+                data={
+                    "title": job.title,
+                    "completed_subtasks": sum(
+                        1 for st in job.subtasks if st.status == SubTaskStatus.COMPLETED
+                    ),
+                    "queue_position": job.queue_position,
+                },
+            ))
+        if jobs:
+            # The backlog may exceed the queue bound; feed it in without blocking startup.
+            self._requeuer = asyncio.create_task(self._requeue(jobs))
+        return len(jobs)
+
+    async def _requeue(self, jobs: list[Job]):
+        for job in jobs:
+            await self._queue.put(job)
+
+    def _prepare_resume(self, job: Job):
+        """Reset everything about a persisted job that didn't survive the restart."""
+        if job.status == JobStatus.DECOMPOSING:
+            # The plan was still streaming: dependencies on subtasks that never
+            # arrived can't be honoured, so decompose the job again from scratch
+            job.subtasks = []
+            job.deliverables = []
+            return
+        for st in job.subtasks:
+            if st.status == SubTaskStatus.COMPLETED and _deliverable_exists(st.deliverable):
+                continue
+            st.status = (
+                SubTaskStatus.WAITING_DEPENDENCY if st.dependencies else SubTaskStatus.PENDING
+            )
+            st.deliverable = None
+            st.started_at = None
+            st.completed_at = None
+            # Agent IDs are regenerated on every startup
+            st.assigned_agent_id = None
+        job.deliverables = []
+
+    async def _resume_job(self, job: Job):
+        """Continue a recovered job's subtask graph from where it stopped."""
+        registry = get_registry()
+        for st in job.subtasks:
+            if st.status == SubTaskStatus.COMPLETED or st.assigned_agent_id:
+                continue
+            candidates = registry.find_by_skill(st.required_skill)
+            if candidates:
+                st.assigned_agent_id = self._select_agent(candidates).id
+                self._prefetch_match(st)
+        job.status = JobStatus.IN_PROGRESS
+        await self._execute_subtask_graph(job)
+
+    async def _run_job(self, job: Job):
+        """Determine routing strategy and run the job to completion."""
+        if job.subtasks:
+            # Recovered after a restart with its plan already in place
+            await self._resume_job(job)
+        elif self._needs_orchestration(job):
+            await self._orchestrate_job(job)
+        else:
+            await self._route_simple_job(job)
+
     def _needs_orchestration(self, job: Job) -> bool:
         """A job needs orchestration if it requires multiple different skills."""
         return len(job.required_skills) > 1
@@ -59,7 +305,6 @@ class JobRouter:
     async def _route_simple_job(self, job: Job):
         """Route a single-skill job directly to the best agent."""
         registry = get_registry()
-        mesh = get_mesh()
 
         skill = job.required_skills[0] if job.required_skills else Skill.WRITING
 
@@ -76,20 +321,20 @@ class JobRouter:
         candidates = registry.find_by_skill(skill)
         if not candidates:
             job.status = JobStatus.FAILED
-            await mesh.emit(MeshEvent(
+            await self._emit(job, MeshEvent(
                 type=MeshEventType.JOB_FAILED,
                 job_id=job.id,
                 data={"error": f"No available agent for skill: {skill.value}"},
             ))
             return
 
-        agent_profile = candidates[0]
+        agent_profile = self._select_agent(candidates)
         agent_instance = registry.get_instance(agent_profile.id)
         subtask.assigned_agent_id = agent_profile.id
         job.assigned_agent_id = agent_profile.id
         job.status = JobStatus.IN_PROGRESS
 
-        await mesh.emit(MeshEvent(
+        await self._emit(job, MeshEvent(
             type=MeshEventType.SUBTASK_ASSIGNED,
             job_id=job.id,
             agent_id=agent_profile.id,
@@ -100,22 +345,32 @@ class JobRouter:
         # Execute (pass model overrides so agents can choose user-selected models)
         await self._execute_subtask(job, subtask, agent_profile.id, {"model_overrides": job.model_overrides})
 
+        # The slot may have gone to another agent with the same skill
+        job.assigned_agent_id = subtask.assigned_agent_id
+        agent_profile = registry.get_profile(subtask.assigned_agent_id) or agent_profile
+
         # Complete the job
         if subtask.status == SubTaskStatus.COMPLETED and subtask.deliverable:
             job.deliverables = [subtask.deliverable]
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.utcnow()
             agent_profile.jobs_completed += 1
-            await mesh.emit(MeshEvent(
+            await self._emit(job, MeshEvent(
                 type=MeshEventType.JOB_COMPLETED,
                 job_id=job.id,
                 data={"deliverables_count": len(job.deliverables)},
             ))
+        else:
+            job.status = JobStatus.FAILED
+            await self._emit(job, MeshEvent(
+                type=MeshEventType.JOB_FAILED,
+                job_id=job.id,
+                data={"failed_subtasks": [subtask.title]},
+            ))
 
     async def _orchestrate_job(self, job: Job):
-        """Decompose a complex job via the Orchestrator, then execute subtasks."""
+        """Decompose a complex job via the Orchestrator, executing subtasks as the plan streams in."""
         registry = get_registry()
-        mesh = get_mesh()
         job.status = JobStatus.DECOMPOSING
 
         # Find orchestrator
@@ -125,7 +380,7 @@ class JobRouter:
             await self._route_simple_job(job)
             return
 
-        orch_profile = orchestrators[0]
+        orch_profile = self._select_agent(orchestrators)
         orch_instance = registry.get_instance(orch_profile.id)
 
         # Decompose via orchestrator
@@ -137,121 +392,166 @@ class JobRouter:
             assigned_agent_id=orch_profile.id,
         )
 
-        try:
-            deliverable = await orch_instance.execute(decompose_subtask)
-            decomposition = JobDecomposition.model_validate(
-                deliverable.metadata.get("decomposition", {})
-            )
-        except Exception as e:
-            job.status = JobStatus.FAILED
-            await mesh.emit(MeshEvent(
-                type=MeshEventType.JOB_FAILED,
-                job_id=job.id,
-                data={"error": f"Decomposition failed: {str(e)}"},
-            ))
-            return
-
-        # Create subtasks from decomposition
-        subtasks: list[SubTask] = []
-        for i, plan in enumerate(decomposition.subtasks):
-            st = SubTask(
-                job_id=job.id,
-                title=plan.title,
-                description=plan.description,
-                required_skill=plan.required_skill,
-            )
-            subtasks.append(st)
+        # Stream the plan, dispatching each subtask as soon as it's parsed
+        stream = orch_instance.stream(decompose_subtask)
+        scheduler = self._graph_scheduler(job, sealed=False)
+        runner = asyncio.create_task(scheduler.run())
+        started = datetime.utcnow()
+        ids_by_index: dict[int, str] = {}  # plan index -> subtask ID, including forward references
 
-        # Map dependency indices to subtask IDs
-        for i, plan in enumerate(decomposition.subtasks):
-            for dep_idx in plan.dependencies:
-                if 0 <= dep_idx < len(subtasks):
-                    subtasks[i].dependencies.append(subtasks[dep_idx].id)
-                    subtasks[i].status = SubTaskStatus.WAITING_DEPENDENCY
-
-        job.subtasks = subtasks
-        job.status = JobStatus.IN_PROGRESS
-
-        await mesh.emit(MeshEvent(
-            type=MeshEventType.JOB_DECOMPOSED,
-            job_id=job.id,
-            data={
-                "reasoning": decomposition.reasoning,
-                "subtask_count": len(subtasks),
-                "subtasks": [{"title": s.title, "skill": s.required_skill.value} for s in subtasks],
-            },
-        ))
+        plans = aiter(stream)
 
-        # Assign agents to subtasks
-        for st in subtasks:
-            candidates = registry.find_by_skill(st.required_skill)
-            if candidates:
-                st.assigned_agent_id = candidates[0].id
-                await mesh.emit(MeshEvent(
-                    type=MeshEventType.SUBTASK_ASSIGNED,
+        # If this worker is cancelled (e.g. router.stop()), take the plan stream and
+        # every subtask the runner started down with it
+        try:
+            try:
+                index = 0
+                async for plan in plans:
+                    st = SubTask(
+                        id=ids_by_index.setdefault(index, str(uuid.uuid4())),
+                        job_id=job.id,
+                        title=plan.title,
+                        description=plan.description,
+                        required_skill=plan.required_skill,
+                    )
+                    for dep_idx in plan.dependencies:
+                        if dep_idx >= 0 and dep_idx != index:
+                            st.dependencies.append(ids_by_index.setdefault(dep_idx, str(uuid.uuid4())))
+                    if st.dependencies:
+                        st.status = SubTaskStatus.WAITING_DEPENDENCY
+                    index += 1
+
+                    candidates = registry.find_by_skill(st.required_skill)
+                    if candidates:
+                        chosen = self._select_agent(candidates)
+                        st.assigned_agent_id = chosen.id
+                        self._prefetch_match(st)
+                        await self._emit(job, MeshEvent(
+                            type=MeshEventType.SUBTASK_ASSIGNED,
+                            job_id=job.id,
+                            agent_id=chosen.id,
+                            subtask_id=st.id,
+                            data={"skill": st.required_skill.value, "agent_name": chosen.name},
+                        ))
+
+                    # The job stays DECOMPOSING until the plan is sealed, so a restart
+                    # mid-stream re-plans instead of resuming a partial plan
+                    job.subtasks.append(st)
+                    scheduler.add(st)
+            except Exception as e:
+                scheduler.abort(f"Decomposition failed: {str(e)}")
+                await runner
+                if job.subtasks:
+                    await self._finish_graph(job, started)
+                    return
+                job.status = JobStatus.FAILED
+                await self._emit(job, MeshEvent(
+                    type=MeshEventType.JOB_FAILED,
                     job_id=job.id,
-                    agent_id=candidates[0].id,
-                    subtask_id=st.id,
-                    data={"skill": st.required_skill.value, "agent_name": candidates[0].name},
+                    data={"error": f"Decomposition failed: {str(e)}"},
                 ))
+                return
 
-        # Execute subtasks respecting dependencies
-        await self._execute_subtask_graph(job)
+            scheduler.seal()
+            decomposition = stream.decomposition
+            job.status = JobStatus.IN_PROGRESS
 
-    async def _execute_subtask_graph(self, job: Job):
-        """Execute subtasks respecting dependency ordering, parallelizing where possible."""
-        mesh = get_mesh()
-        completed_ids: set[str] = set()
-        subtask_map = {st.id: st for st in job.subtasks}
-        deliverable_map: dict[str, Deliverable] = {}  # subtask_id -> deliverable
+            await self._emit(job, MeshEvent(
+                type=MeshEventType.JOB_DECOMPOSED,
+                job_id=job.id,
+                data={
+                    "reasoning": decomposition.reasoning,
+                    "subtask_count": len(job.subtasks),
+                    "subtasks": [{"title": s.title, "skill": s.required_skill.value} for s in job.subtasks],
+                    "cache_hit": stream.cache_hit,
+                    **stream.model_info,
+                },
+            ))
 
-        while True:
-            # Find ready subtasks (all dependencies completed)
-            ready = [
-                st for st in job.subtasks
-                if st.status in (SubTaskStatus.PENDING, SubTaskStatus.WAITING_DEPENDENCY)
-                and st.assigned_agent_id
-                and all(dep_id in completed_ids for dep_id in st.dependencies)
-            ]
-
-            if not ready:
-                # Check if all done or stuck
-                all_done = all(
-                    st.status in (SubTaskStatus.COMPLETED, SubTaskStatus.FAILED)
-                    for st in job.subtasks
-                )
-                if all_done:
-                    break
-                # Deadlock or no ready tasks
-                break
-
-            # Execute ready subtasks in parallel
-            tasks = []
-            for st in ready:
-                # Build context from completed dependencies
-                context = {}
-                for dep_id in st.dependencies:
-                    if dep_id in deliverable_map:
-                        dep_deliverable = deliverable_map[dep_id]
-                        context["input_text"] = dep_deliverable.content
-
-                tasks.append(
-                    self._execute_subtask(
-                        job,
-                        st,
-                        st.assigned_agent_id,
-                        {**context, "model_overrides": job.model_overrides},
-                    )
+            # Wait for the rest of the graph
+            await runner
+            await self._finish_graph(job, started)
+        finally:
+            await plans.aclose()
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+
+    def _graph_scheduler(self, job: Job, sealed: bool = True) -> SubtaskScheduler:
+        """Build a scheduler that runs the job's subtasks through _execute_subtask."""
+        streams: dict[str, TextStream] = {}  # producer subtask_id -> its live output
+
+        async def run(st: SubTask):
+            # Build context from completed dependencies
+            subtask_map = {s.id: s for s in job.subtasks}
+            context = {}
+            for dep_id in st.dependencies:
+                dep = subtask_map.get(dep_id)
+                if dep and dep.deliverable:
+                    context["input_text"] = dep.deliverable.content
+                elif dep_id in streams:
+                    # Started early: read the producer's output as it is written
+                    context["input_stream"] = streams[dep_id]
+
+            output = None
+            if st.required_skill in PIPELINE_SOURCES and get_settings().pipeline_handoffs:
+                output = streams[st.id] = TextStream()
+                context["output_stream"] = output
+
+            try:
+                await self._execute_subtask(
+                    job,
+                    st,
+                    st.assigned_agent_id,
+                    {**context, "model_overrides": job.model_overrides},
                 )
+            except asyncio.CancelledError:
+                if output is not None:
+                    output.fail(f"{st.title} was cancelled")  # don't leave a pipelined reader waiting
+                raise
 
-            await asyncio.gather(*tasks)
-
-            # Update tracking
-            for st in ready:
+            if output is not None:
                 if st.status == SubTaskStatus.COMPLETED:
-                    completed_ids.add(st.id)
-                    if st.deliverable:
-                        deliverable_map[st.id] = st.deliverable
+                    # Agents that didn't stream still hand over their full output
+                    if not output.has_data and st.deliverable:
+                        output.push(st.deliverable.content)
+                    output.close()
+                else:
+                    output.fail(f"{st.title} failed")
+
+        async def cancel(st: SubTask, reason: str):
+            st.status = SubTaskStatus.FAILED
+            await self._emit(job, MeshEvent(
+                type=MeshEventType.SUBTASK_FAILED,
+                job_id=job.id,
+                agent_id=st.assigned_agent_id,
+                subtask_id=st.id,
+                data={"title": st.title, "error": reason},
+            ))
+
+        def can_pipeline(upstream: SubTask, downstream: SubTask) -> bool:
+            return (
+                get_settings().pipeline_handoffs
+                and (upstream.required_skill, downstream.required_skill) in PIPELINED_HANDOFFS
+            )
+
+        return SubtaskScheduler(run, cancel, sealed=sealed, can_pipeline=can_pipeline)
+
+    async def _execute_subtask_graph(self, job: Job):
+        """Execute subtasks as soon as their dependencies complete, parallelizing where possible."""
+        started = datetime.utcnow()
+        scheduler = self._graph_scheduler(job)
+        for st in job.subtasks:
+            scheduler.add(st)
+        await scheduler.run()
+        await self._finish_graph(job, started)
+
+    async def _finish_graph(self, job: Job, started: datetime):
+        """Assemble deliverables and emit the job's final status once its graph has drained."""
+        timing = {
+            "critical_path_seconds": round(critical_path_seconds(job.subtasks), 3),
+            "wall_clock_seconds": round((datetime.utcnow() - started).total_seconds(), 3),
+        }
 
         # Assemble final deliverables
         job.deliverables = [
@@ -263,20 +563,19 @@ class JobRouter:
         if all_completed:
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.utcnow()
-            await mesh.emit(MeshEvent(
+            await self._emit(job, MeshEvent(
                 type=MeshEventType.JOB_COMPLETED,
                 job_id=job.id,
-                data={"deliverables_count": len(job.deliverables)},
+                data={"deliverables_count": len(job.deliverables), **timing},
             ))
         else:
             failed = [st for st in job.subtasks if st.status == SubTaskStatus.FAILED]
-            if failed:
-                job.status = JobStatus.FAILED
-                await mesh.emit(MeshEvent(
-                    type=MeshEventType.JOB_FAILED,
-                    job_id=job.id,
-                    data={"failed_subtasks": [st.title for st in failed]},
-                ))
+            job.status = JobStatus.FAILED
+            await self._emit(job, MeshEvent(
+                type=MeshEventType.JOB_FAILED,
+                job_id=job.id,
+                data={"failed_subtasks": [st.title for st in failed], **timing},
+            ))
 
     async def _execute_subtask(
         self,
@@ -287,34 +586,75 @@ class JobRouter:
     ):
         """Execute a single subtask with the given agent."""
         registry = get_registry()
-        mesh = get_mesh()
 
-        agent_instance = registry.get_instance(agent_id)
-        agent_profile = registry.get_profile(agent_id)
+        # Re-run selection at dispatch time: load may have shifted since assignment
+        candidates = registry.find_by_skill(subtask.required_skill)
+        if candidates:
+            agent_id = self._match_agent(candidates, subtask).id
 
-        if not agent_instance or not agent_profile:
+        # Wait for a free slot, preferring the chosen agent
+        queued_at = datetime.utcnow()
+        try:
+            agent_profile = await registry.acquire(subtask.required_skill, preferred_id=agent_id)
+        except TimeoutError as e:
+            subtask.status = SubTaskStatus.FAILED
+            await self._emit(job, MeshEvent(
+                type=MeshEventType.SUBTASK_FAILED,
+                job_id=job.id,
+                agent_id=agent_id,
+                subtask_id=subtask.id,
+                data={"title": subtask.title, "error": str(e)},
+            ))
+            return
+
+        agent_id = agent_profile.id
+        if agent_id != subtask.assigned_agent_id:
+            subtask.assigned_agent_id = agent_id
+            await self._emit(job, MeshEvent(
+                type=MeshEventType.SUBTASK_ASSIGNED,
+                job_id=job.id,
+                agent_id=agent_id,
+                subtask_id=subtask.id,
+                data={"skill": subtask.required_skill.value, "agent_name": agent_profile.name},
+            ))
+
+        agent_instance = registry.get_instance(agent_id)
+        if not agent_instance:
+            registry.release(agent_id)
             subtask.status = SubTaskStatus.FAILED
             return
 
         subtask.status = SubTaskStatus.IN_PROGRESS
         subtask.started_at = datetime.utcnow()
-        registry.set_status(agent_id, AgentStatus.BUSY)
 
-        await mesh.emit(MeshEvent(
+        await self._emit(job, MeshEvent(
             type=MeshEventType.SUBTASK_STARTED,
             job_id=job.id,
             agent_id=agent_id,
             subtask_id=subtask.id,
-            data={"title": subtask.title},
+            data={
+                "title": subtask.title,
+                "queued_seconds": round((subtask.started_at - queued_at).total_seconds(), 3),
+            },
         ))
 
+        context = dict(context or {})
+        output = context.pop("output_stream", None)
+        policy = resolve_retry_policy(agent_profile, subtask.required_skill)
+
+        self._stats.started(agent_id)
+        exec_start = time.monotonic()
+        ok = False
         try:
-            deliverable = await agent_instance.execute(subtask, context)
+            deliverable, outcome = await self._execute_with_retries(
+                job, subtask, agent_id, agent_instance, context, output, policy
+            )
+            ok = True
             subtask.deliverable = deliverable
             subtask.status = SubTaskStatus.COMPLETED
             subtask.completed_at = datetime.utcnow()
 
-            await mesh.emit(MeshEvent(
+            await self._emit(job, MeshEvent(
                 type=MeshEventType.SUBTASK_COMPLETED,
                 job_id=job.id,
                 agent_id=agent_id,
@@ -322,12 +662,13 @@ class JobRouter:
                 data={
                     "title": subtask.title,
                     "deliverable_type": deliverable.type.value,
+                    **outcome,
                 },
             ))
         except Exception as e:
             subtask.status = SubTaskStatus.FAILED
 
-            await mesh.emit(MeshEvent(
+            await self._emit(job, MeshEvent(
                 type=MeshEventType.SUBTASK_FAILED,
                 job_id=job.id,
                 agent_id=agent_id,
@@ -335,13 +676,148 @@ class JobRouter:
                 data={"title": subtask.title, "error": str(e)},
             ))
         finally:
-            registry.set_status(agent_id, AgentStatus.AVAILABLE)
+            self._stats.finished(agent_id, time.monotonic() - exec_start, ok)
+            registry.release(agent_id)
+
+    async def _execute_with_retries(
+        self,
+        job: Job,
+        subtask: SubTask,
+        agent_id: str,
+        agent_instance: BaseAgent,
+        context: dict,
+        output: TextStream | None,
+        policy: RetryPolicy,
+    ) -> tuple[Deliverable, dict]:
+        """Run the agent, retrying transient failures with backoff.
+
+        Output already handed to a pipelined consumer can't be taken back, so a
+        failure after the first streamed chunk is final.
+        """
+        attempt = 1
+        while True:
+            try:
+                deliverable, hedge_won = await self._attempt(
+                    job, subtask, agent_id, agent_instance, context, output, policy
+                )
+                return deliverable, {"attempts": attempt, "hedge_won": hedge_won}
+            except Exception as e:
+                if (
+                    attempt >= policy.max_attempts
+                    or not is_transient(e)
+                    or (output is not None and output.has_data)
+                ):
+                    raise
+                delay = policy.backoff(attempt)
+                attempt += 1
+                await self._emit(job, MeshEvent(
+                    type=MeshEventType.SUBTASK_RETRYING,
+                    job_id=job.id,
+                    agent_id=agent_id,
+                    subtask_id=subtask.id,
+                    data={
+                        "title": subtask.title,
+                        "attempt": attempt,
+                        "delay": round(delay, 3),
+                        "error": str(e),
+                    },
+                ))
+                await asyncio.sleep(delay)
+
+    async def _attempt(
+        self,
+        job: Job,
+        subtask: SubTask,
+        agent_id: str,
+        agent_instance: BaseAgent,
+        context: dict,
+        output: TextStream | None,
+        policy: RetryPolicy,
+    ) -> tuple[Deliverable, bool]:
+        """One execution, hedged with a duplicate if it stalls past the skill's hedge percentile.
+
+        Returns the deliverable and whether the hedge produced it.
+        """
+        skill = subtask.required_skill
+        # Streaming agents push output through on_delta; subscribers get coalesced chunks
+        # (a fresh coalescer per attempt, so offsets restart at 0) and a pipelined
+        # consumer, if any, reads the raw text.
+        deltas = DeltaCoalescer(job.id, subtask.id, agent_id)
+        streamed = False
+        forwarding = True
+
+        async def on_delta(text: str):
+            nonlocal streamed
+            if not forwarding:
+                return
+            streamed = True
+            if output is not None:
+                output.push(text)
+            await deltas.push(text)
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(
+            agent_instance.execute(subtask, {**context, "on_delta": on_delta})
+        )
+        hedge: asyncio.Task | None = None
+        try:
+            hedge_after = self._latencies.percentile(skill, policy.hedge_percentile) if policy.hedge else None
+            if hedge_after is not None:
+                await asyncio.wait({primary}, timeout=hedge_after)
+            # A call that is already streaming isn't stalled; hedge only silent ones
+            hedge_profile = None
+            if not primary.done() and hedge_after is not None and not streamed:
+                hedge_profile = get_registry().try_acquire(skill)
+            if hedge_profile is None:
+                deliverable = await primary
+                await deltas.flush()
+                self._latencies.record(skill, time.monotonic() - started)
+                return deliverable, False
+
+            # From here the winner's full output is handed over on completion
+            forwarding = False
+            hedge_started = time.monotonic()
+            hedge = asyncio.ensure_future(self._run_hedge(hedge_profile, subtask, context))
+            pending = {primary, hedge}
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner_started = hedge_started if task is hedge else started
+                        self._latencies.record(skill, time.monotonic() - winner_started)
+                        return task.result(), task is hedge
+                    if error is None or task is primary:
+                        error = task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def _run_hedge(self, profile: AgentProfile, subtask: SubTask, context: dict) -> Deliverable:
+        """Duplicate execution on a slot taken with try_acquire; never streams output."""
+        registry = get_registry()
+        instance = registry.get_instance(profile.id)
+        self._stats.started(profile.id)
+        started = time.monotonic()
+        ok = False
+        try:
+            if instance is None:
+                raise RuntimeError(f"Agent {profile.name} has no runtime instance")
+            deliverable = await instance.execute(subtask, {**context, "on_delta": None})
+            ok = True
+            return deliverable
+        finally:
+            self._stats.finished(profile.id, time.monotonic() - started, ok)
+            registry.release(profile.id)
 
     async def rate_job(self, job_id: str, rating: float, review: str = "") -> Job | None:
-        job = self._jobs.get(job_id)
+        job = await self.get_job(job_id)
         if not job or job.status != JobStatus.COMPLETED:
             return None
         job.rating = rating
+        get_job_store().mark_dirty(job)
         # Update agent rating
         registry = get_registry()
         if job.assigned_agent_id:
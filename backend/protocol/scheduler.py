@@ -0,0 +1,211 @@
+"""Subtask Scheduler — event-driven DAG execution for a job's subtasks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import Awaitable, Callable
+
+from backend.protocol.models import SubTask, SubTaskStatus
+
+ExecuteFn = Callable[[SubTask], Awaitable[None]]
+CancelFn = Callable[[SubTask, str], Awaitable[None]]
+PipelineFn = Callable[[SubTask, SubTask], bool]  # (upstream, downstream) -> can overlap
+
+
+class SubtaskScheduler:
+    """Runs a subtask DAG, starting each subtask as soon as its last dependency completes.
+
+    There are no barrier "waves": every completion is handled individually, so a
+    slow branch never holds back an unrelated one. When a subtask fails, all of its
+    transitive dependents are cancelled straight away instead of waiting for the
+    rest of the graph to drain.
+
+    The graph may keep growing while it runs: create the scheduler with
+    `sealed=False`, `add()` subtasks as they become known, and `seal()` once the
+    plan is complete. Dependencies that never appear by then are ignored.
+
+    With `can_pipeline`, a subtask whose only dependency is still running may
+    start alongside it when the predicate allows — the executor is then
+    responsible for feeding it the upstream output as it is produced.
+    """
+
+    def __init__(
+        self,
+        execute: ExecuteFn,
+        cancel: CancelFn,
+        sealed: bool = True,
+        can_pipeline: PipelineFn | None = None,
+    ):
+        self._execute = execute  # runs a subtask and leaves its final status on it
+        self._cancel = cancel  # marks a subtask that will never run as failed
+        self._can_pipeline = can_pipeline
+        self._sealed = sealed
+        self._abort_reason: str | None = None
+        self._changed = asyncio.Event()
+        self._subtasks: dict[str, SubTask] = {}
+        self._pending_deps: dict[str, set[str]] = {}  # subtask_id -> unfinished dependency IDs
+        self._dependents: dict[str, list[str]] = defaultdict(list)  # subtask_id -> dependent IDs
+        self._running: dict[asyncio.Task, str] = {}
+        self._completed: set[str] = set()
+        self._failed: set[str] = set()
+
+    def add(self, subtask: SubTask):
+        self._subtasks[subtask.id] = subtask
+        for dep_id in subtask.dependencies:
+            self._dependents[dep_id].append(subtask.id)
+        if subtask.status == SubTaskStatus.COMPLETED:
+            self._completed.add(subtask.id)
+            self._release_dependents(subtask.id)
+        else:
+            self._pending_deps[subtask.id] = {
+                dep_id for dep_id in subtask.dependencies if dep_id not in self._completed
+            }
+        self._changed.set()
+
+    def seal(self):
+        """No more subtasks will be added."""
+        self._sealed = True
+        self._changed.set()
+
+    def abort(self, reason: str):
+        """Fail everything not yet started; subtasks already running finish normally."""
+        self._abort_reason = reason
+        self._sealed = True
+        self._changed.set()
+
+    async def run(self):
+        """Execute the graph until every subtask has completed or failed.
+
+        If run() itself is cancelled, every subtask still running is cancelled
+        with it and awaited before the cancellation propagates.
+        """
+        try:
+            await self._run()
+        finally:
+            for task in self._running:
+                task.cancel()
+            await asyncio.gather(*self._running, return_exceptions=True)
+            self._running.clear()
+
+    async def _run(self):
+        while True:
+            self._changed.clear()
+            if self._abort_reason is not None:
+                for subtask_id in list(self._pending_deps):
+                    await self._fail(subtask_id, self._abort_reason)
+            if self._sealed:
+                self._drop_unknown_dependencies()
+            await self._start_ready()
+            if not self._running and self._sealed:
+                break
+
+            changed = asyncio.ensure_future(self._changed.wait())
+            try:
+                done, _ = await asyncio.wait(
+                    [*self._running, changed], return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                changed.cancel()
+            for task in done:
+                if task is changed:
+                    continue
+                subtask_id = self._running.pop(task)
+                subtask = self._subtasks[subtask_id]
+                if task.cancelled():
+                    await self._fail(subtask_id, "Subtask was cancelled")
+                elif task.exception() is None and subtask.status == SubTaskStatus.COMPLETED:
+                    self._completed.add(subtask_id)
+                    self._release_dependents(subtask_id)
+                else:
+                    await self._fail(subtask_id, None)
+
+        # Anything left over is unreachable (e.g. a dependency cycle).
+        for subtask_id in list(self._pending_deps):
+            await self._fail(subtask_id, "Dependency cycle")
+
+    def _release_dependents(self, subtask_id: str):
+        for dep_id in self._dependents.get(subtask_id, []):
+            if dep_id in self._pending_deps:
+                self._pending_deps[dep_id].discard(subtask_id)
+
+    def _drop_unknown_dependencies(self):
+        for subtask_id, deps in self._pending_deps.items():
+            unknown = {dep_id for dep_id in deps if dep_id not in self._subtasks}
+            if unknown:
+                deps -= unknown
+                subtask = self._subtasks[subtask_id]
+                subtask.dependencies = [d for d in subtask.dependencies if d not in unknown]
+
+    async def _start_ready(self):
+        for subtask_id, deps in list(self._pending_deps.items()):
+            if deps & self._failed:
+                failed = self._subtasks[next(iter(deps & self._failed))]
+                await self._fail(subtask_id, f"Upstream subtask failed: {failed.title}")
+
+        # Starting a subtask can make a pipelined dependent startable too
+        while ready := [
+            sid for sid, deps in self._pending_deps.items()
+            if not deps or self._pipelinable(sid, deps)
+        ]:
+            for subtask_id in ready:
+                del self._pending_deps[subtask_id]
+                subtask = self._subtasks[subtask_id]
+                if not subtask.assigned_agent_id:
+                    await self._fail(
+                        subtask_id, f"No available agent for skill: {subtask.required_skill.value}"
+                    )
+                    continue
+                task = asyncio.create_task(self._execute(subtask))
+                self._running[task] = subtask_id
+
+    def _pipelinable(self, subtask_id: str, deps: set[str]) -> bool:
+        if self._can_pipeline is None or len(deps) != 1:
+            return False
+        (upstream_id,) = deps
+        if upstream_id not in self._running.values():
+            return False
+        return self._can_pipeline(self._subtasks[upstream_id], self._subtasks[subtask_id])
+
+    async def _fail(self, subtask_id: str, reason: str | None):
+        """Mark a subtask failed and cancel everything downstream of it."""
+        stack = [(subtask_id, reason)]
+        while stack:
+            sid, why = stack.pop()
+            if sid in self._failed:
+                continue
+            self._failed.add(sid)
+            self._pending_deps.pop(sid, None)
+            subtask = self._subtasks.get(sid)
+            if subtask is not None and why is not None:
+                await self._cancel(subtask, why)
+            upstream = subtask.title if subtask is not None else sid
+            for dep_id in self._dependents.get(sid, []):
+                if dep_id in self._pending_deps:
+                    stack.append((dep_id, f"Upstream subtask failed: {upstream}"))
+
+
+def critical_path_seconds(subtasks: list[SubTask]) -> float:
+    """Length of the longest dependency chain, measured by actual execution time.
+
+    A subtask that overlapped its dependencies (pipelined) only counts the time
+    it ran past the last of them.
+    """
+    by_id = {st.id: st for st in subtasks}
+    finish: dict[str, float] = {}
+
+    def _finish(st: SubTask, seen: frozenset[str]) -> float:
+        if st.id in finish:
+            return finish[st.id]
+        deps = [by_id[d] for d in st.dependencies if d in by_id and d not in seen]
+        duration = 0.0
+        if st.started_at and st.completed_at:
+            start = max(
+                [st.started_at, *(d.completed_at for d in deps if d.completed_at)]
+            )
+            duration = max(0.0, (st.completed_at - start).total_seconds())
+        upstream = [_finish(d, seen | {st.id}) for d in deps]
+        finish[st.id] = duration + max(upstream, default=0.0)
+        return finish[st.id]
+
+    return max((_finish(st, frozenset()) for st in subtasks), default=0.0)
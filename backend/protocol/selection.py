@@ -0,0 +1,145 @@
+"""Agent selection policies — pick which candidate agent gets a subtask."""
+
+from __future__ import annotations
+
+import random
+import statistics
+from abc import ABC, abstractmethod
+
+from pydantic import BaseModel
+
+from backend.protocol.models import AgentProfile
+
+# Floor on the success rate used to inflate latency, so an agent that only fails
+# costs 20x its latency rather than infinity and still gets an occasional retry
+MIN_SUCCESS_RATE = 0.05
+
+
+class AgentStats(BaseModel):
+    """Per-agent load and latency, as observed by the router."""
+    outstanding: int = 0  # subtasks currently executing
+    completed: int = 0
+    failed: int = 0
+    ewma_latency: float | None = None  # seconds, successful executions only
+    error_rate: float = 0.0  # EWMA over all executions, 1 for a failure and 0 for a success
+
+
+class AgentStatsTracker:
+    """Records the router's observations of each agent's `execute` calls."""
+
+    def __init__(self, alpha: float = 0.3):
+        self._alpha = alpha
+        self._stats: dict[str, AgentStats] = {}
+
+    def get(self, agent_id: str) -> AgentStats:
+        if agent_id not in self._stats:
+            self._stats[agent_id] = AgentStats()
+        return self._stats[agent_id]
+
+    def started(self, agent_id: str):
+        self.get(agent_id).outstanding += 1
+
+    def finished(self, agent_id: str, latency: float, ok: bool):
+        stats = self.get(agent_id)
+        stats.outstanding = max(0, stats.outstanding - 1)
+        stats.error_rate = self._alpha * (0.0 if ok else 1.0) + (1 - self._alpha) * stats.error_rate
+        if not ok:
+            stats.failed += 1
+            return
+        stats.completed += 1
+        if stats.ewma_latency is None:
+            stats.ewma_latency = latency
+        else:
+            stats.ewma_latency = self._alpha * latency + (1 - self._alpha) * stats.ewma_latency
+
+    def expected_latency(self, agent_id: str, default: float) -> float:
+        """Seconds until a successful result: EWMA latency inflated by the error rate.
+
+        Each failure costs a retry, so an agent that fails fast is not cheaper for
+        it. Agents without a successful sample yet are assumed to take `default`.
+        """
+        s = self.get(agent_id)
+        latency = s.ewma_latency if s.ewma_latency is not None else default
+        return latency / max(1.0 - s.error_rate, MIN_SUCCESS_RATE)
+
+    def peer_latency(self, candidates: list[AgentProfile]) -> float:
+        """Mean EWMA latency of the candidates that have one (0 if none do)."""
+        samples = [
+            s.ewma_latency for p in candidates
+            if (s := self.get(p.id)).ewma_latency is not None
+        ]
+        return statistics.fmean(samples) if samples else 0.0
+
+    def snapshot(self) -> dict[str, dict]:
+        return {agent_id: s.model_dump() for agent_id, s in self._stats.items()}
+
+
+class SelectionPolicy(ABC):
+    """Chooses one agent from a non-empty list of candidates."""
+
+    name: str
+
+    @abstractmethod
+    def choose(self, candidates: list[AgentProfile], stats: AgentStatsTracker) -> AgentProfile:
+        ...
+
+
+class LeastOutstandingPolicy(SelectionPolicy):
+    """Fewest in-flight subtasks; ties go to the earliest-registered agent."""
+
+    name = "least_outstanding"
+
+    def choose(self, candidates: list[AgentProfile], stats: AgentStatsTracker) -> AgentProfile:
+        return min(candidates, key=lambda p: stats.get(p.id).outstanding)
+
+
+class EwmaLatencyPolicy(SelectionPolicy):
+    """Lowest expected wait: expected latency scaled by in-flight load.
+
+    Expected latency folds in each agent's error rate; agents with no latency
+    sample yet are assumed to be as fast as the mean of their peers.
+    """
+
+    name = "ewma_latency"
+
+    def choose(self, candidates: list[AgentProfile], stats: AgentStatsTracker) -> AgentProfile:
+        default = stats.peer_latency(candidates)
+
+        def cost(p: AgentProfile) -> float:
+            return stats.expected_latency(p.id, default) * (stats.get(p.id).outstanding + 1)
+
+        return min(candidates, key=cost)
+
+
+class PowerOfTwoChoicesPolicy(SelectionPolicy):
+    """Sample two candidates at random and keep the less loaded one, then the faster."""
+
+    name = "p2c"
+
+    def __init__(self, rng: random.Random | None = None):
+        self._rng = rng or random.Random()
+
+    def choose(self, candidates: list[AgentProfile], stats: AgentStatsTracker) -> AgentProfile:
+        if len(candidates) == 1:
+            return candidates[0]
+        pair = self._rng.sample(candidates, 2)
+
+        default = stats.peer_latency(candidates)
+
+        def load(p: AgentProfile) -> tuple[int, float]:
+            return stats.get(p.id).outstanding, stats.expected_latency(p.id, default)
+
+        return min(pair, key=load)
+
+
+POLICIES: dict[str, type[SelectionPolicy]] = {
+    LeastOutstandingPolicy.name: LeastOutstandingPolicy,
+    EwmaLatencyPolicy.name: EwmaLatencyPolicy,
+    PowerOfTwoChoicesPolicy.name: PowerOfTwoChoicesPolicy,
+}
+
+
+def get_selection_policy(name: str) -> SelectionPolicy:
+    if name not in POLICIES:
+        raise ValueError(f"Unknown agent selection policy '{name}' (choose from {', '.join(POLICIES)})")
+    return POLICIES[name]()
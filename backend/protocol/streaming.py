@@ -0,0 +1,108 @@
+"""Streaming helpers — coalesce token deltas for job subscribers, and pipe text between subtasks."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import AsyncIterator
+
+from backend.config import get_settings
+from backend.protocol.mesh import get_mesh
+from backend.protocol.models import MeshEvent, MeshEventType
+
+
+class DeltaCoalescer:
+    """Buffers a subtask's streamed text and broadcasts it in batches.
+
+    Emitting one WebSocket message per token would swamp slow clients; instead,
+    deltas are flushed at most every `interval_ms`, or sooner once `max_chars`
+    have accumulated.
+    """
+
+    def __init__(self, job_id: str, subtask_id: str, agent_id: str | None = None):
+        settings = get_settings()
+        self._job_id = job_id
+        self._subtask_id = subtask_id
+        self._agent_id = agent_id
+        self._interval = settings.stream_delta_interval_ms / 1000
+        self._max_chars = settings.stream_delta_max_chars
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._offset = 0  # characters already flushed
+        self._last_flush = time.monotonic()
+
+    async def push(self, text: str):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if (
+            self._buffered >= self._max_chars
+            or time.monotonic() - self._last_flush >= self._interval
+        ):
+            await self.flush()
+
+    async def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        delta = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        await get_mesh().broadcast_job(MeshEvent(
+            type=MeshEventType.SUBTASK_DELTA,
+            job_id=self._job_id,
+            agent_id=self._agent_id,
+            subtask_id=self._subtask_id,
+            data={"delta": delta, "offset": self._offset},
+        ))
+        self._offset += len(delta)
+
+
+class TextStream:
+    """An append-only text stream that any number of consumers can read from the start.
+
+    Used to pipeline one subtask's output into a dependent subtask that starts
+    before the producer has finished.
+    """
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._closed = False
+        self._error: str | None = None
+        self._changed = asyncio.Event()
+
+    @property
+    def has_data(self) -> bool:
+        return bool(self._chunks)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed or self._error is not None
+
+    def push(self, text: str):
+        if text:
+            self._chunks.append(text)
+            self._notify()
+
+    def close(self):
+        self._closed = True
+        self._notify()
+
+    def fail(self, reason: str):
+        self._error = reason
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        i = 0
+        while True:
+            while i < len(self._chunks):
+                yield self._chunks[i]
+                i += 1
+            if self._error is not None:
+                raise RuntimeError(f"Upstream stream failed: {self._error}")
+            if self._closed:
+                return
+            await self._changed.wait()
@@ -0,0 +1,148 @@
+"""Circuit breakers — stop sending calls to a model that is failing or too slow."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from enum import Enum
+
+from backend.config import get_settings
+from backend.services.limiter import provider_status
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when every model that could serve a call has an open breaker."""
+
+    status_code = 503  # so retry and throttling logic treat it like provider overload
+
+
+def counts_as_failure(exc: BaseException) -> bool:
+    """Provider-side failures trip the breaker; a rejected request (4xx) is the caller's fault."""
+    status = provider_status(exc)
+    return status is None or status >= 500 or status == 429
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a rolling window of calls.
+
+    Opens once at least `min_calls` are in the window and either the error rate
+    or the share of calls slower than `latency_slo` reaches its threshold. After
+    `open_seconds` it lets a single probe through (half-open): a fast success
+    closes it, anything else re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_rate: float = 0.5,
+        latency_slo: float = 30.0,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self._calls: deque[tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+        self._min_calls = min_calls
+        self._error_rate = error_rate
+        self._slow_rate = slow_rate
+        self._latency_slo = latency_slo
+        self._open_seconds = open_seconds
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == BreakerState.OPEN and time.monotonic() - self._opened_at >= self._open_seconds:
+            self._state = BreakerState.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to this model now. In half-open, admits one probe at a time."""
+        state = self.state
+        if state == BreakerState.CLOSED:
+            return True
+        if state == BreakerState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record(self, ok: bool, latency: float):
+        slow = latency > self._latency_slo
+        if self._state == BreakerState.HALF_OPEN:
+            self._probing = False
+            if ok and not slow:
+                self._close()
+            else:
+                self._open()
+            return
+        self._calls.append((not ok, slow))
+        if len(self._calls) < self._min_calls:
+            return
+        failures = sum(1 for failed, _ in self._calls if failed)
+        slows = sum(1 for _, s in self._calls if s)
+        if (
+            failures / len(self._calls) >= self._error_rate
+            or slows / len(self._calls) >= self._slow_rate
+        ):
+            self._open()
+
+    def abandon(self):
+        """A call ended without a verdict (cancelled); free the half-open probe."""
+        self._probing = False
+
+    def _open(self):
+        if self._state != BreakerState.OPEN:
+            logger.warning("Circuit for %s opened", self.name)
+            self.opened += 1
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+
+    def _close(self):
+        logger.info("Circuit for %s closed", self.name)
+        self._state = BreakerState.CLOSED
+        self._calls.clear()
+
+    def stats(self) -> dict:
+        failures = sum(1 for failed, _ in self._calls if failed)
+        return {
+            "state": self.state.value,
+            "window_calls": len(self._calls),
+            "window_failures": failures,
+            "opened": self.opened,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    if name not in _breakers:
+        s = get_settings()
+        _breakers[name] = CircuitBreaker(
+            name,
+            window=s.breaker_window,
+            min_calls=s.breaker_min_calls,
+            error_rate=s.breaker_error_rate,
+            slow_rate=s.breaker_slow_rate,
+            latency_slo=s.breaker_latency_slo_seconds,
+            open_seconds=s.breaker_open_seconds,
+        )
+    return _breakers[name]
+
+
+def breaker_stats() -> dict:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
@@ -0,0 +1,345 @@
+"""In-process caches shared by the service layer."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, TypeVar
+
+from backend.config import get_settings
+from backend.services.io import STATIC_DIR, run_blocking, temp_path, write_atomic, write_bytes
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate in-memory footprint of a cached value, in bytes."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    try:
+        return len(json.dumps(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+class TTLCache:
+    """LRU cache with per-entry TTL and hit/miss counters.
+
+    Entries are evicted least-recently-used first once there are more than
+    `max_entries`, or once their total size exceeds `max_bytes` if set.
+
+    With `disk_dir` set, entries are also written as JSON files there, so they
+    survive restarts. Values must be JSON-serializable in that case. Expired
+    files are swept at startup and then once per TTL, and the oldest files are
+    deleted whenever the directory grows past `disk_max_bytes`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        disk_dir: str | Path | None = None,
+        max_bytes: int | None = None,
+        disk_max_bytes: int | None = None,
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        # key -> (expires_at, value, size in bytes)
+        self._entries: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._disk_dir = Path(disk_dir) if disk_dir else None
+        self._disk_max_bytes = disk_max_bytes
+        self._disk_bytes = 0
+        self._next_sweep = 0.0
+        if self._disk_dir:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            self._sweep_disk()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value, _ = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._forget(key)
+
+        entry = self._read_disk(key, now)
+        if entry is not None:
+            self._remember(key, *entry)
+            self.hits += 1
+            self.disk_hits += 1
+            return entry[1]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any):
+        expires_at = time.time() + self._ttl
+        self._remember(key, expires_at, value)
+        self._write_disk(key, expires_at, value)
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        self._forget(key)
+        size = _sizeof(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return  # would evict everything else and still not fit
+        self._entries[key] = (expires_at, value, size)
+        self._bytes += size
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None and self._bytes > self._max_bytes
+        ):
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def _forget(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _disk_path(self, key: str) -> Path:
+        return self._disk_dir / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float) -> tuple[float, Any] | None:
+        if not self._disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("expires_at", 0) <= now:
+            path.unlink(missing_ok=True)
+            return None
+        return data["expires_at"], data["value"]
+
+    def _write_disk(self, key: str, expires_at: float, value: Any):
+        if not self._disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp = temp_path(path)
+        try:
+            data = json.dumps({"expires_at": expires_at, "value": value}).encode()
+            tmp.write_bytes(data)
+            replaced = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            logger.warning("Could not write cache entry %s to disk", key, exc_info=True)
+            return
+        finally:
+            tmp.unlink(missing_ok=True)
+        self._disk_bytes += len(data) - replaced
+        over_cap = self._disk_max_bytes is not None and self._disk_bytes > self._disk_max_bytes
+        if over_cap or time.time() >= self._next_sweep:
+            self._sweep_disk()
+
+    def _sweep_disk(self):
+        """Delete expired entry files, then the oldest ones until the directory fits the cap."""
+        now = time.time()
+        files = []
+        for path in self._disk_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            # A file's mtime is when its entry was written, so it expires a TTL later
+            if stat.st_mtime + self._ttl <= now:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        if self._disk_max_bytes is not None and total > self._disk_max_bytes:
+            files.sort(key=lambda f: f[0])
+            for _, size, path in files:
+                if total <= self._disk_max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+        self._disk_bytes = total
+        self._next_sweep = now + self._ttl
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "disk_bytes": self._disk_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def media_cache_dir() -> Path:
+    configured = get_settings().media_cache_dir
+    return Path(configured) if configured else STATIC_DIR / "cache"
+
+
+class FileCache:
+    """Content-addressed files in one directory, capped in total size.
+
+    Files are named `{prefix}{key}{suffix}`. A hit touches the file, so eviction
+    by oldest mtime removes the least recently used entries first. File system
+    work runs off the event loop.
+
+    With `publish_dir` set, lookups and stores return a hard link (or copy) of
+    the entry in that directory instead of the cache file itself. Published
+    files are outside the cache's accounting, so eviction never removes them.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        prefix: str,
+        suffix: str,
+        max_bytes: int,
+        publish_dir: str | Path | None = None,
+    ):
+        self._dir = Path(directory)
+        self._prefix = prefix
+        self._suffix = suffix
+        self._max_bytes = max_bytes
+        self._publish_dir = Path(publish_dir) if publish_dir else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path(self, key: str) -> Path:
+        return self._dir / f"{self._prefix}{key}{self._suffix}"
+
+    async def lookup(self, key: str) -> Path | None:
+        found = await run_blocking(self._lookup, self.path(key))
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+    def _lookup(self, path: Path) -> Path | None:
+        if not _touch(path):
+            return None
+        if self._publish_dir is None:
+            return path
+        try:
+            return _publish(path, self._publish_dir)
+        except FileNotFoundError:  # evicted between the touch and the link
+            return None
+
+    async def store(self, key: str, data: bytes) -> Path:
+        path = self.path(key)
+        await write_bytes(path, data)
+        self.evictions += await run_blocking(self._evict, path)
+        if self._publish_dir is None:
+            return path
+        return await run_blocking(_publish, path, self._publish_dir, data)
+
+    def _evict(self, keep: Path) -> int:
+        files = []
+        for path in self._dir.glob(f"{self._prefix}*{self._suffix}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= self._max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        if evicted:
+            logger.info("Evicted %d file(s) from %s*%s cache", evicted, self._prefix, self._suffix)
+        return evicted
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _publish(path: Path, directory: Path, data: bytes | None = None) -> Path:
+    """Hard-link a cache file into `directory` under the same name, copying across file systems.
+
+    If the cache file is already gone, `data` (when given) is written instead.
+    """
+    target = directory / path.name
+    if target.exists():
+        return target
+    directory.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(path, target)
+    except FileExistsError:
+        pass  # a concurrent publish of the same key got there first; same content
+    except OSError as e:
+        if data is not None:
+            write_atomic(target, data)
+        elif isinstance(e, FileNotFoundError):
+            raise
+        else:
+            tmp = temp_path(target)
+            try:
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, target)
+            finally:
+                tmp.unlink(missing_ok=True)
+    return target
+
+
+def _touch(path: Path) -> bool:
+    """Bump a file's mtime; False if it doesn't exist."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    Every caller awaits the same shared task, shielded so that one caller being
+    cancelled doesn't cancel the work for the others.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._discard(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _discard(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
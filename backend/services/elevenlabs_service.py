@@ -1,23 +1,49 @@
-"""ElevenLabs TTS service wrapper."""
+"""ElevenLabs TTS service wrapper (async client; nothing here blocks the event loop)."""
 
 from __future__ import annotations
 
-import os
+import hashlib
+import json
 import uuid
 from pathlib import Path
 
-from elevenlabs.client import ElevenLabs
-from elevenlabs import save
+from elevenlabs.client import AsyncElevenLabs
 
 from backend.config import get_settings
+from backend.services.cache import FileCache, SingleFlight, media_cache_dir
+from backend.services.io import deliverables_dir, write_bytes
+from backend.services.limiter import get_limiter
+from backend.services.transport import get_transport
 
-DELIVERABLES_DIR = Path(__file__).parent.parent / "static" / "deliverables"
+DELIVERABLES_DIR = deliverables_dir()
+OUTPUT_FORMAT = "mp3_44100_128"  # MP3 frames concatenate cleanly, so chunks can be joined
+
+
+def tts_cache_key(voice_id: str, model_id: str, output_format: str, text: str) -> str:
+    payload = json.dumps([voice_id, model_id, output_format, text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
 
 
 class ElevenLabsService:
     def __init__(self):
         self._settings = get_settings()
-        self._client = ElevenLabs(api_key=self._settings.elevenlabs_api_key)
+        self._client = self._make_client()
+        self._limiter = get_limiter("elevenlabs")
+        # Narrations are cached as tts_<hash>.mp3 and linked into the deliverables directory
+        self._cache = FileCache(
+            media_cache_dir(),
+            prefix="tts_",
+            suffix=".mp3",
+            max_bytes=self._settings.tts_cache_max_bytes,
+            publish_dir=DELIVERABLES_DIR,
+        )
+        self._flights = SingleFlight()
+
+    def _make_client(self) -> AsyncElevenLabs:
+        return AsyncElevenLabs(
+            api_key=self._settings.elevenlabs_api_key,
+            httpx_client=get_transport().client("elevenlabs"),
+        )
 
     async def text_to_speech(
         self,
@@ -25,21 +51,70 @@ class ElevenLabsService:
         voice_id: str | None = None,
         model_id: str | None = None,
     ) -> tuple[str, str]:
-        """Generate speech from text. Returns (filename, filepath)."""
+        """Generate speech from text. Returns (filename, filepath).
+
+        Identical (voice, model, format, text) requests return the file already
+        on disk without calling the API, and concurrent ones share a single call.
+        """
+        if not self._settings.tts_cache_enabled:
+            audio = await self.synthesize(text, voice_id=voice_id, model_id=model_id)
+            return await self.save_audio(audio)
+
         voice_id = voice_id or self._settings.elevenlabs_voice_id
         model_id = model_id or self._settings.elevenlabs_model
+        key = tts_cache_key(voice_id, model_id, OUTPUT_FORMAT, text)
 
-        audio = self._client.text_to_speech.convert(
-            voice_id=voice_id,
-            text=text,
-            model_id=model_id,
-            output_format="mp3_44100_128",
-        )
+        async def _generate() -> Path:
+            path = await self._cache.lookup(key)
+            if path is None:
+                audio = await self.synthesize(text, voice_id=voice_id, model_id=model_id)
+                path = await self._cache.store(key, audio)
+            return path
+
+        path = await self._flights.do(key, _generate)
+        return path.name, str(path)
+
+    def cache_stats(self) -> dict:
+        return {
+            "enabled": self._settings.tts_cache_enabled,
+            **self._cache.stats(),
+            "coalesced": self._flights.coalesced,
+        }
 
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        model_id: str | None = None,
+        previous_text: str | None = None,
+    ) -> bytes:
+        """Generate MP3 bytes for one piece of text.
+
+        `previous_text` is the narration that precedes this piece, so chunks
+        synthesized separately keep a continuous intonation.
+        """
+        voice_id = voice_id or self._settings.elevenlabs_voice_id
+        model_id = model_id or self._settings.elevenlabs_model
+        extra = {"previous_text": previous_text} if previous_text else {}
+
+        chunks = []
+        async with self._limiter.slot() as permit:
+            async for chunk in self._client.text_to_speech.convert(
+                voice_id=voice_id,
+                text=text,
+                model_id=model_id,
+                output_format=OUTPUT_FORMAT,
+                **extra,
+            ):
+                permit.first_token()
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def save_audio(self, audio: bytes) -> tuple[str, str]:
+        """Write MP3 bytes to the deliverables directory. Returns (filename, filepath)."""
         filename = f"voice_{uuid.uuid4().hex[:8]}.mp3"
         filepath = DELIVERABLES_DIR / filename
-        DELIVERABLES_DIR.mkdir(parents=True, exist_ok=True)
-        save(audio, str(filepath))
+        await write_bytes(filepath, audio)
 
         return filename, str(filepath)
 
@@ -50,5 +125,10 @@ _service: ElevenLabsService | None = None
 def get_elevenlabs_service() -> ElevenLabsService:
     global _service
     if _service is None:
-        _service = ElevenLabsService()
+        if get_settings().simulate_providers:
+            from backend.services.simulation import SimulatedElevenLabsService
+
+            _service = SimulatedElevenLabsService()
+        else:
+            _service = ElevenLabsService()
     return _service
@@ -0,0 +1,326 @@
+"""Embedding subsystem — micro-batched, cached text embeddings and vectorized similarity search.
+
+Vectors are L2-normalised when stored, so cosine similarity is a plain dot
+product and ranking N candidates is one (N x dim) @ (dim,) matrix-vector
+multiply.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+from backend.config import get_settings
+from backend.services.huggingface_service import get_huggingface_service
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise rows (or a single vector) as float32; zero vectors stay zero."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> list[tuple[int, float]]:
+    """Indices and scores of the k rows of `matrix` most similar to `query`, best first."""
+    if matrix.shape[0] == 0 or k <= 0:
+        return []
+    scores = matrix @ query
+    k = min(k, scores.shape[0])
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.argsort(-scores[best])]
+    return [(int(i), float(scores[i])) for i in best]
+
+
+class EmbeddingStore:
+    """Normalised vectors in one contiguous float32 matrix, indexed by text hash.
+
+    With `directory` set, the matrix is saved as an .npy file plus a JSON list of
+    keys, and loaded back memory-mapped; it is copied into RAM only once new
+    vectors have to be appended.
+    """
+
+    def __init__(self, directory: str | Path | None = None):
+        self._dir = Path(directory) if directory else None
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._rows: dict[str, int] = {}
+        self._keys: list[str] = []
+        if self._dir:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def dim(self) -> int | None:
+        return self._matrix.shape[1] if self._keys else None
+
+    def row(self, key: str) -> int | None:
+        return self._rows.get(key)
+
+    def vectors(self, rows: list[int] | np.ndarray) -> np.ndarray:
+        return self._matrix[np.asarray(rows, dtype=np.intp)]
+
+    def add(self, key: str, vector: np.ndarray) -> int:
+        if key in self._rows:
+            return self._rows[key]
+        vector = normalize(vector)
+        n = len(self._keys)
+        if n and vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(f"Embedding dimension {vector.shape[0]} != store dimension {self._matrix.shape[1]}")
+        self._reserve(n + 1, vector.shape[0])
+        self._matrix[n] = vector
+        self._rows[key] = n
+        self._keys.append(key)
+        return n
+
+    def _reserve(self, rows: int, dim: int):
+        writable = isinstance(self._matrix, np.ndarray) and not isinstance(self._matrix, np.memmap)
+        if writable and self._matrix.shape[0] >= rows:
+            return
+        capacity = max(rows, 2 * self._matrix.shape[0], 64)
+        grown = np.empty((capacity, dim), dtype=np.float32)
+        n = len(self._keys)
+        if n:
+            grown[:n] = self._matrix[:n]
+        self._matrix = grown
+
+    def _paths(self) -> tuple[Path, Path]:
+        return self._dir / "embeddings.npy", self._dir / "embeddings.json"
+
+    def _load(self):
+        matrix_path, keys_path = self._paths()
+        try:
+            keys = json.loads(keys_path.read_text())
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return
+        if matrix.ndim != 2 or matrix.shape[0] != len(keys):
+            logger.warning("Ignoring inconsistent embedding cache in %s", self._dir)
+            return
+        self._matrix = matrix
+        self._keys = list(keys)
+        self._rows = {key: i for i, key in enumerate(self._keys)}
+
+    def save(self):
+        """Write the used rows and their keys; readers never see a half-written pair."""
+        if not self._dir or not self._keys:
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        matrix_path, keys_path = self._paths()
+        n = len(self._keys)
+        tmp_matrix = matrix_path.with_name(".embeddings.tmp.npy")
+        tmp_keys = keys_path.with_suffix(".tmp")
+        np.save(tmp_matrix, np.ascontiguousarray(self._matrix[:n]))
+        tmp_keys.write_text(json.dumps(self._keys))
+        os.replace(tmp_matrix, matrix_path)
+        os.replace(tmp_keys, keys_path)
+
+
+class VectorIndex:
+    """A labelled set of vectors kept in its own contiguous matrix for one-shot scoring.
+
+    Rows live in a preallocated matrix that doubles when full; removal moves the
+    last row into the gap, so both operations stay O(dim).
+    """
+
+    def __init__(self):
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    @property
+    def ids(self) -> list[str]:
+        return list(self._ids)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix[: len(self._ids)]
+
+    def set(self, item_id: str, vector: np.ndarray):
+        vector = normalize(vector)
+        if item_id in self._positions:
+            self._matrix[self._positions[item_id]] = vector
+            return
+        n = len(self._ids)
+        if n == self._matrix.shape[0]:
+            grown = np.empty((max(64, 2 * n), vector.shape[0]), dtype=np.float32)
+            if n:
+                grown[:n] = self._matrix[:n]
+            self._matrix = grown
+        self._matrix[n] = vector
+        self._positions[item_id] = n
+        self._ids.append(item_id)
+
+    def remove(self, item_id: str):
+        pos = self._positions.pop(item_id, None)
+        if pos is None:
+            return
+        last = len(self._ids) - 1
+        if pos != last:
+            moved = self._ids[last]
+            self._matrix[pos] = self._matrix[last]
+            self._ids[pos] = moved
+            self._positions[moved] = pos
+        self._ids.pop()
+
+    def scores(self, query: np.ndarray, ids: list[str] | None = None) -> np.ndarray:
+        """Cosine similarity of `query` to every vector, or to `ids` in the given order."""
+        if ids is None:
+            return self.matrix @ normalize(query) if self._ids else np.empty(0, dtype=np.float32)
+        positions = np.fromiter((self._positions[i] for i in ids), dtype=np.intp, count=len(ids))
+        return self._matrix[positions] @ normalize(query)
+
+    def search(self, query: np.ndarray, k: int) -> list[tuple[str, float]]:
+        return [(self._ids[i], score) for i, score in top_k(self.matrix, normalize(query), k)]
+
+
+class EmbeddingService:
+    """Embeds texts through HuggingFace, batching concurrent requests and caching by text hash.
+
+    Requests arriving within `batch_window_ms` of each other (up to `batch_size`
+    texts) go out as one feature-extraction call; a text already being embedded
+    is never requested twice.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self._model = settings.hf_embedding_model
+        self._batch_size = settings.embedding_batch_size
+        self._window = settings.embedding_batch_window_ms / 1000
+        self._store = EmbeddingStore(settings.embedding_cache_dir)
+        self._pending: dict[str, tuple[str, asyncio.Future]] = {}  # key -> (text, future)
+        self._flusher: asyncio.Task | None = None  # flushes after the batch window
+        self._flushes: set[asyncio.Task] = set()  # flushes of full batches
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.embedded = 0  # texts sent to the API
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self._model}\n{text}".encode()).hexdigest()
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        """Normalised embeddings for `texts`, one row each, in order."""
+        keys = [self.key(t) for t in texts]
+        waits = []
+        for key, text in zip(keys, texts):
+            if self._store.row(key) is not None:
+                self.hits += 1
+                continue
+            self.misses += 1
+            if key not in self._pending:
+                self._pending[key] = (text, asyncio.get_running_loop().create_future())
+                self._schedule_flush()
+            waits.append(self._pending[key][1])
+        if waits:
+            await asyncio.gather(*waits)
+        return self._store.vectors([self._store.row(k) for k in keys])
+
+    async def embed_one(self, text: str) -> np.ndarray:
+        return (await self.embed([text]))[0]
+
+    def cached(self, text: str) -> np.ndarray | None:
+        """The stored embedding for `text`, or None without making a request."""
+        row = self._store.row(self.key(text))
+        return None if row is None else self._store.vectors([row])[0]
+
+    def _schedule_flush(self):
+        if len(self._pending) >= self._batch_size:
+            task = asyncio.create_task(self._flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_after_window())
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self._window)
+        while self._pending:
+            await self._flush()
+
+    async def _flush(self):
+        if not self._pending:
+            return
+        keys = list(self._pending)[: self._batch_size]
+        batch = {key: self._pending.pop(key) for key in keys}
+        texts = [text for text, _ in batch.values()]
+        self.batches += 1
+        self.embedded += len(texts)
+        try:
+            vectors = _as_matrix(await get_huggingface_service().get_embeddings(texts, model=self._model))
+            if vectors.shape[0] != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings, got {vectors.shape[0]}")
+            for key, vector in zip(batch, vectors):
+                self._store.add(key, vector)
+        except asyncio.CancelledError:
+            for _, fut in batch.values():
+                fut.cancel()
+            raise
+        except Exception as e:
+            for _, fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for _, fut in batch.values():
+            if not fut.done():
+                fut.set_result(None)
+
+    def save(self):
+        self._store.save()
+
+    async def stop(self):
+        """Cancel batches still in flight, then save the store."""
+        tasks = [*self._flushes, *([self._flusher] if self._flusher else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for _, fut in self._pending.values():
+            fut.cancel()
+        self._pending.clear()
+        self.save()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "vectors": len(self._store),
+            "dim": self._store.dim,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "batches": self.batches,
+            "avg_batch_size": round(self.embedded / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+def _as_matrix(result) -> np.ndarray:
+    """Feature-extraction output as (n, dim); token-level output is mean-pooled."""
+    arr = np.asarray(result, dtype=np.float32)
+    if arr.ndim == 1:
+        arr = arr[np.newaxis, :]
+    elif arr.ndim == 3:
+        arr = arr.mean(axis=1)
+    return arr
+
+
+_service: EmbeddingService | None = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    global _service
+    if _service is None:
+        _service = EmbeddingService()
+    return _service
@@ -1,16 +1,43 @@
-"""HuggingFace Inference service wrapper — image generation + embeddings."""
+"""HuggingFace Inference service wrapper — image generation + embeddings.
+
+Calls go straight to the inference router over the shared pooled HTTP client
+(see backend/services/transport.py), throttled by the provider's adaptive limiter.
+"""
 
 from __future__ import annotations
 
+import hashlib
+import io
+import json
 import uuid
 from pathlib import Path
 
-from huggingface_hub import InferenceClient
+import httpx
 import numpy as np
 
 from backend.config import get_settings
+from backend.services.cache import FileCache, media_cache_dir, SingleFlight
+from backend.services.io import deliverables_dir, run_blocking, write_bytes
+from backend.services.limiter import get_limiter
+from backend.services.transport import get_transport
+
+DELIVERABLES_DIR = deliverables_dir()
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _to_png(data: bytes) -> bytes:
+    """Re-encode an image in any format Pillow reads (JPEG, WebP, ...) as PNG."""
+    from PIL import Image
 
-DELIVERABLES_DIR = Path(__file__).parent.parent / "static" / "deliverables"
+    with Image.open(io.BytesIO(data)) as image:
+        out = io.BytesIO()
+        image.save(out, format="PNG")
+    return out.getvalue()
+
+
+def image_cache_key(model_url: str, prompt: str, parameters: dict | None) -> str:
+    payload = json.dumps([model_url, prompt, parameters or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
 
 
 class HuggingFaceService:
@@ -18,7 +45,23 @@ class HuggingFaceService:
         self._settings = get_settings()
         # Hugging Face deprecated api-inference.huggingface.co.
         # Use the router service and pass fully qualified URLs per call.
-        self._client = InferenceClient(token=self._settings.huggingface_api_key)
+        self._http = self._make_http()
+        self._headers = {"Authorization": f"Bearer {self._settings.huggingface_api_key}"}
+        self._limiter = get_limiter("huggingface")
+        # Embeddings are limited separately so image generation can't starve matching
+        self._embedding_limiter = get_limiter("huggingface_embeddings")
+        # Generated images are cached as img_<hash>.png and linked into the deliverables directory
+        self._image_cache = FileCache(
+            media_cache_dir(),
+            prefix="img_",
+            suffix=".png",
+            max_bytes=self._settings.image_cache_max_bytes,
+            publish_dir=DELIVERABLES_DIR,
+        )
+        self._image_flights = SingleFlight()
+
+    def _make_http(self) -> httpx.AsyncClient:
+        return get_transport().client("huggingface")
 
     def _normalize_model_url(self, model: str, kind: str) -> str:
         """Accept plain model id, router shortcut (hf://router/...), or full URL."""
@@ -37,22 +80,60 @@ class HuggingFaceService:
         self,
         prompt: str,
         model: str | None = None,
+        parameters: dict | None = None,
     ) -> tuple[str, str]:
-        """Generate an image from a prompt. Returns (filename, filepath)."""
+        """Generate an image from a prompt. Returns (filename, filepath).
+
+        `parameters` are passed through to the model (e.g. width, height,
+        num_inference_steps). Identical (model, prompt, parameters) requests reuse
+        the stored image, and concurrent ones share a single inference call.
+        """
         model = model or self._settings.hf_image_model
         model_url = self._normalize_model_url(model, kind="model")
 
-        image = self._client.text_to_image(
-            prompt=prompt,
-            model=model_url,
-        )
-
-        filename = f"image_{uuid.uuid4().hex[:8]}.png"
-        filepath = DELIVERABLES_DIR / filename
-        DELIVERABLES_DIR.mkdir(parents=True, exist_ok=True)
-        image.save(str(filepath))
-
-        return filename, str(filepath)
+        if not self._settings.image_cache_enabled:
+            data = await self._text_to_image(model_url, prompt, parameters)
+            filename = f"image_{uuid.uuid4().hex[:8]}.png"
+            filepath = DELIVERABLES_DIR / filename
+            await write_bytes(filepath, data)
+            return filename, str(filepath)
+
+        key = image_cache_key(model_url, prompt, parameters)
+
+        async def _generate() -> Path:
+            path = await self._image_cache.lookup(key)
+            if path is None:
+                data = await self._text_to_image(model_url, prompt, parameters)
+                path = await self._image_cache.store(key, data)
+            return path
+
+        path = await self._image_flights.do(key, _generate)
+        return path.name, str(path)
+
+    async def _text_to_image(self, model_url: str, prompt: str, parameters: dict | None) -> bytes:
+        payload = {"inputs": prompt}
+        if parameters:
+            payload["parameters"] = parameters
+        async with self._limiter.slot():
+            response = await self._http.post(model_url, headers=self._headers, json=payload)
+            response.raise_for_status()
+        # Deliverables and cache entries are .png files; anything else is converted or rejected
+        content_type = response.headers.get("content-type", "")
+        if not content_type.startswith("image/"):
+            raise ValueError(
+                f"Expected an image from {model_url}, got {content_type or 'no content type'}: "
+                f"{response.text[:200]}"
+            )
+        if response.content.startswith(PNG_SIGNATURE):
+            return response.content
+        return await run_blocking(_to_png, response.content)
+
+    def cache_stats(self) -> dict:
+        return {
+            "enabled": self._settings.image_cache_enabled,
+            **self._image_cache.stats(),
+            "coalesced": self._image_flights.coalesced,
+        }
 
     async def get_embeddings(
         self,
@@ -62,19 +143,22 @@ class HuggingFaceService:
         """Get text embeddings for semantic matching."""
         model = model or self._settings.hf_embedding_model
         model_url = self._normalize_model_url(model, kind="pipeline")
-        result = self._client.feature_extraction(
-            text=texts,
-            model=model_url,
-        )
-        if isinstance(result, np.ndarray):
-            return result.tolist()
-        return result
-
-    def cosine_similarity(self, a: list[float], b: list[float]) -> float:
-        """Compute cosine similarity between two vectors."""
-        a_arr = np.array(a)
-        b_arr = np.array(b)
-        return float(np.dot(a_arr, b_arr) / (np.linalg.norm(a_arr) * np.linalg.norm(b_arr)))
+        async with self._embedding_limiter.slot():
+            response = await self._http.post(
+                model_url,
+                headers=self._headers,
+                json={"inputs": texts},
+            )
+            response.raise_for_status()
+        return response.json()
+
+    def cosine_similarity(self, a: list[float], b: list[float] | list[list[float]]) -> float | np.ndarray:
+        """Cosine similarity of `a` to `b`, or to every row of `b` in one pass if it's a matrix."""
+        a_arr = np.asarray(a, dtype=np.float32)
+        b_arr = np.asarray(b, dtype=np.float32)
+        norms = np.linalg.norm(b_arr, axis=-1) * np.linalg.norm(a_arr)
+        sims = (b_arr @ a_arr) / np.where(norms == 0, 1, norms)
+        return float(sims) if b_arr.ndim == 1 else sims
 
 
 _service: HuggingFaceService | None = None
@@ -83,5 +167,10 @@ _service: HuggingFaceService | None = None
 def get_huggingface_service() -> HuggingFaceService:
     global _service
     if _service is None:
-        _service = HuggingFaceService()
+        if get_settings().simulate_providers:
+            from backend.services.simulation import SimulatedHuggingFaceService
+
+            _service = SimulatedHuggingFaceService()
+        else:
+            _service = HuggingFaceService()
     return _service
@@ -0,0 +1,69 @@
+"""Off-loop execution for blocking work — sync SDK calls and file writes."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from backend.config import get_settings
+
+T = TypeVar("T")
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Bounded thread pool shared by provider adapters that only have sync clients."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().provider_thread_pool_size,
+            thread_name_prefix="provider",
+        )
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking callable in the provider pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def temp_path(path: Path) -> Path:
+    """A sibling of `path` unique to this writer, to be renamed over it once complete."""
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = temp_path(path)
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+async def write_bytes(path: str | Path, data: bytes):
+    """Write a file from a worker thread; readers never see a partial file."""
+    await run_blocking(write_atomic, Path(path), data)
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def deliverables_dir() -> Path:
+    """Directory that generated deliverables are written to and served from."""
+    configured = get_settings().deliverables_dir
+    return Path(configured) if configured else STATIC_DIR / "deliverables"
@@ -0,0 +1,236 @@
+"""Adaptive per-provider rate limiting — token bucket plus an AIMD concurrency window."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean "you are sending too much", not "your request is wrong"
+THROTTLE_STATUSES = {429, 503}
+
+
+def provider_status(exc: BaseException) -> int | None:
+    """HTTP status carried by a provider SDK or httpx error, if any."""
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status
+    for attr in ("response", "raw_response"):
+        response = getattr(exc, attr, None)
+        status = getattr(response, "status_code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def provider_retry_after(exc: BaseException) -> float | None:
+    """Seconds from a Retry-After header on a provider error, if present."""
+    for attr in ("response", "raw_response"):
+        headers = getattr(getattr(exc, attr, None), "headers", None)
+        value = headers.get("retry-after") if headers is not None else None
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+    return None
+
+
+def is_throttle(exc: BaseException) -> bool:
+    return provider_status(exc) in THROTTLE_STATUSES
+
+
+class Permit:
+    """Handed to the caller of AdaptiveLimiter.slot().
+
+    Streaming calls mark their first token, so the latency sample is time to
+    first token rather than the length of the whole stream.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.first_token_at: float | None = None
+
+    def first_token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+    @property
+    def latency(self) -> float:
+        return (self.first_token_at or time.monotonic()) - self.started
+
+
+class AdaptiveLimiter:
+    """Throttles calls to one provider.
+
+    A token bucket caps the request rate at `rate` per second with bursts of up
+    to `burst`. On top of that an AIMD window caps concurrent calls: it grows by
+    roughly one slot per window's worth of successful calls, and is cut by
+    `decrease_factor` when the provider throttles us (429/503, honouring
+    Retry-After) or when latency spikes above `spike_factor` times its running
+    average. Cuts happen at most once per average latency, so one burst of
+    errors doesn't collapse the window to the minimum.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.5,
+        spike_factor: float = 3.0,
+        latency_alpha: float = 0.2,
+    ):
+        self.name = name
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._bucket_lock = asyncio.Lock()
+
+        self._max_window = max_concurrency
+        self._min_window = min_concurrency
+        self._window = float(max_concurrency)
+        self._decrease_factor = decrease_factor
+        self._spike_factor = spike_factor
+        self._alpha = latency_alpha
+        self._ewma_latency: float | None = None
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._waiting = 0
+        self._window_changed = asyncio.Condition()
+
+        self.throttled = 0
+        self.spikes = 0
+
+    @property
+    def window(self) -> int:
+        return max(self._min_window, math.floor(self._window))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Permit]:
+        """Wait for a request token and a window slot, then record how the call went."""
+        await self._take_token()
+        await self._enter()
+        permit = Permit()
+        try:
+            yield permit
+        except Exception as e:
+            if is_throttle(e):
+                self.throttled += 1
+                self._decrease(pause=provider_retry_after(e))
+            elif isinstance(e, httpx.TimeoutException):
+                self.spikes += 1
+                self._decrease()
+            raise
+        else:
+            self._record_latency(permit.latency)
+        finally:
+            await self._leave()
+
+    async def _take_token(self):
+        async with self._bucket_lock:  # FIFO among waiters
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    async def _enter(self):
+        async with self._window_changed:
+            self._waiting += 1
+            try:
+                await self._window_changed.wait_for(lambda: self._in_flight < self.window)
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+
+    async def _leave(self):
+        async with self._window_changed:
+            self._in_flight -= 1
+            self._window_changed.notify_all()
+
+    def _record_latency(self, latency: float):
+        baseline = self._ewma_latency
+        if baseline is not None and latency > baseline * self._spike_factor:
+            self.spikes += 1
+            self._decrease()
+        else:
+            # Additive increase: about +1 slot per window of successful calls
+            self._window = min(self._max_window, self._window + 1 / max(self._window, 1))
+        self._ewma_latency = (
+            latency if baseline is None else self._alpha * latency + (1 - self._alpha) * baseline
+        )
+
+    def _decrease(self, pause: float | None = None):
+        now = time.monotonic()
+        if pause:
+            self._paused_until = max(self._paused_until, now + pause)
+        if now - self._last_decrease < (self._ewma_latency or 1.0):
+            return
+        self._last_decrease = now
+        self._window = max(self._min_window, self._window * self._decrease_factor)
+        logger.info("%s limiter window cut to %d", self.name, self.window)
+
+    def stats(self) -> dict:
+        return {
+            "rate_per_second": self._rate,
+            "burst": self._burst,
+            "tokens": round(min(self._burst, self._tokens), 2),
+            "window": self.window,
+            "max_window": self._max_window,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "ewma_latency": round(self._ewma_latency, 3) if self._ewma_latency is not None else None,
+            "throttled": self.throttled,
+            "spikes": self.spikes,
+        }
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiter(provider: str) -> AdaptiveLimiter:
+    if provider not in _limiters:
+        s = get_settings()
+        rate, burst, max_concurrency = {
+            "mistral": (s.mistral_rps, s.mistral_burst, s.mistral_max_concurrency),
+            "elevenlabs": (s.elevenlabs_rps, s.elevenlabs_burst, s.elevenlabs_max_concurrency),
+            "huggingface": (s.hf_rps, s.hf_burst, s.hf_max_concurrency),
+            "huggingface_embeddings": (
+                s.hf_embedding_rps, s.hf_embedding_burst, s.hf_embedding_max_concurrency,
+            ),
+        }[provider]
+        _limiters[provider] = AdaptiveLimiter(
+            provider,
+            rate=rate,
+            burst=burst,
+            max_concurrency=max_concurrency,
+            min_concurrency=s.limiter_min_concurrency,
+            decrease_factor=s.limiter_decrease_factor,
+            spike_factor=s.limiter_latency_spike_factor,
+        )
+    return _limiters[provider]
+
+
+def limiter_stats() -> dict:
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
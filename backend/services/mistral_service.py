@@ -2,40 +2,258 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import Type, TypeVar
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Type, TypeVar
 
 from mistralai import Mistral
 from pydantic import BaseModel
 
 from backend.config import get_settings
+from backend.services.breaker import CircuitOpenError, counts_as_failure, get_breaker
+from backend.services.cache import TTLCache
+from backend.services.limiter import Permit, get_limiter
+from backend.services.transport import get_transport
 
 T = TypeVar("T", bound=BaseModel)
 
+# (requested model, model that actually served) for the current task's last call
+_model_choice: ContextVar[tuple[str, str] | None] = ContextVar("mistral_model_choice", default=None)
+
+
+def model_metadata() -> dict:
+    """Deliverable metadata naming the model behind the current task's last Mistral call."""
+    choice = _model_choice.get()
+    if choice is None:
+        return {}
+    requested, served = choice
+    if served == requested:
+        return {"model": served}
+    return {"model": served, "fallback_from": requested}
+
+
+def response_cache_key(kind: str, model: str, system_prompt: str | None, messages: list[dict]) -> str:
+    """Content hash of a completion request. `kind` separates text from JSON-mode output."""
+    payload = json.dumps(
+        {"kind": kind, "model": model, "system": system_prompt, "messages": messages},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+_cache: TTLCache | None = None
+
+
+def get_response_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = TTLCache(
+            max_entries=settings.mistral_cache_max_entries,
+            ttl_seconds=settings.mistral_cache_ttl_seconds,
+            disk_dir=settings.mistral_cache_dir,
+            disk_max_bytes=settings.mistral_cache_disk_max_bytes,
+            max_bytes=settings.mistral_cache_max_bytes,
+        )
+    return _cache
+
 
 class MistralService:
     def __init__(self):
         self._settings = get_settings()
-        self._client = Mistral(api_key=self._settings.mistral_api_key)
+        self._client = self._make_client()
+        # What cache hits would have cost, from the latency/usage of the original call
+        self._limiter = get_limiter("mistral")
+        self.saved_seconds = 0.0
+        self.saved_tokens = 0
+
+    def _make_client(self) -> Mistral:
+        return Mistral(
+            api_key=self._settings.mistral_api_key,
+            async_client=get_transport().client("mistral"),
+        )
+
+    def _build_messages(self, messages: list[dict], system_prompt: str | None) -> list[dict]:
+        msgs = []
+        if system_prompt:
+            msgs.append({"role": "system", "content": system_prompt})
+        msgs.extend(messages)
+        return msgs
+
+    def _cache_lookup(self, key: str | None, requested_model: str) -> str | None:
+        if key is None:
+            return None
+        cached = get_response_cache().get(key)
+        if cached is None:
+            return None
+        _model_choice.set((requested_model, cached.get("model", requested_model)))
+        self.saved_seconds += cached["seconds"]
+        self.saved_tokens += cached["tokens"]
+        return cached["text"]
+
+    def _cache_store(self, key: str | None, text: str, started: float, tokens: int | None):
+        choice = _model_choice.get()
+        # Keys name the requested model; a fallback tier's answer must not be served under it
+        if key is not None and not (choice and choice[0] != choice[1]):
+            get_response_cache().set(key, {
+                "text": text,
+                "model": choice[1] if choice else None,
+                "seconds": round(time.monotonic() - started, 3),
+                "tokens": tokens or 0,
+            })
+
+    def _cache_key(
+        self,
+        use_cache: bool,
+        kind: str,
+        model: str,
+        system_prompt: str | None,
+        messages: list[dict],
+    ) -> str | None:
+        """The request's cache key, or None when caching is off for this call."""
+        if not (use_cache and self._settings.mistral_cache_enabled):
+            return None
+        return response_cache_key(kind, model, system_prompt, messages)
+
+    def fallback_chain(self, requested: str) -> list[str]:
+        """`requested` followed by the tiers below it; models outside the chain have no fallback."""
+        chain = self._settings.mistral_fallback_chain or [
+            self._settings.mistral_large_model,
+            self._settings.mistral_medium_model,
+            self._settings.mistral_small_model,
+        ]
+        if requested not in chain:
+            return [requested]
+        return chain[chain.index(requested):]
+
+    @asynccontextmanager
+    async def _completion(self, requested: str) -> AsyncIterator[tuple[str, Permit]]:
+        """Route a completion to the first model in the fallback chain whose breaker is closed.
+
+        Holds a limiter slot for the call and reports its outcome to the model's
+        breaker. Yields (model, permit).
+        """
+        candidates = self.fallback_chain(requested)
+        model = next((m for m in candidates if get_breaker(m).allow()), None)
+        if model is None:
+            raise CircuitOpenError(f"Circuit open for {', '.join(candidates)}")
+        _model_choice.set((requested, model))
+        breaker = get_breaker(model)
+        recorded = False
+        # Everything after allow() sits inside this try, so a half-open probe that is
+        # cancelled or fails while still queued for a limiter slot is handed back
+        try:
+            async with self._limiter.slot() as permit:
+                try:
+                    yield model, permit
+                except Exception as e:
+                    if counts_as_failure(e):
+                        breaker.record(False, permit.latency)
+                        recorded = True
+                    raise
+                breaker.record(True, permit.latency)
+                recorded = True
+        finally:
+            if not recorded:
+                breaker.abandon()
+
+    def cache_stats(self) -> dict:
+        return {
+            "enabled": self._settings.mistral_cache_enabled,
+            **get_response_cache().stats(),
+            "saved_seconds": round(self.saved_seconds, 3),
+            "saved_tokens": self.saved_tokens,
+        }
 
     async def chat(
         self,
         messages: list[dict],
         model: str | None = None,
         system_prompt: str | None = None,
+        on_delta: Callable[[str], Awaitable[None]] | None = None,
+        use_cache: bool = True,
     ) -> str:
-        """Simple chat completion returning text content."""
-        model = model or self._settings.mistral_medium_model
-        msgs = []
-        if system_prompt:
-            msgs.append({"role": "system", "content": system_prompt})
-        msgs.extend(messages)
+        """Simple chat completion returning text content.
+
+        With `on_delta`, the completion is streamed and each text delta is passed to
+        the callback as it arrives; the full text is still returned at the end.
+
+        Responses are served from the response cache when it is enabled in
+        settings; pass `use_cache=False` to always call the API.
+        """
+        if on_delta is not None:
+            parts = []
+            async for delta in self.chat_stream(
+                messages, model=model, system_prompt=system_prompt, use_cache=use_cache
+            ):
+                parts.append(delta)
+                await on_delta(delta)
+            return "".join(parts)
+
+        requested = model or self._settings.mistral_medium_model
+        key = self._cache_key(use_cache, "text", requested, system_prompt, messages)
+        cached = self._cache_lookup(key, requested)
+        if cached is not None:
+            return cached
+
+        started = time.monotonic()
+        async with self._completion(requested) as (model, _):
+            response = await self._client.chat.complete_async(
+                model=model,
+                messages=self._build_messages(messages, system_prompt),
+            )
+        content = response.choices[0].message.content
+        self._cache_store(key, content, started, _total_tokens(response))
+        return content
+
+    async def chat_stream(
+        self,
+        messages: list[dict],
+        model: str | None = None,
+        system_prompt: str | None = None,
+        json_mode: bool = False,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """Streaming chat completion yielding text deltas as they arrive.
 
-        response = await self._client.chat.complete_async(
-            model=model,
-            messages=msgs,
+        A cache hit yields the whole response as a single delta.
+        """
+        requested = model or self._settings.mistral_medium_model
+        key = self._cache_key(
+            use_cache, "json" if json_mode else "text", requested, system_prompt, messages
         )
-        return response.choices[0].message.content
+        cached = self._cache_lookup(key, requested)
+        if cached is not None:
+            yield cached
+            return
+
+        started = time.monotonic()
+        kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+        parts = []
+        tokens = None
+        # The slot is held for the whole stream; its latency sample is time to first token
+        async with self._completion(requested) as (model, permit):
+            response = await self._client.chat.stream_async(
+                model=model,
+                messages=self._build_messages(messages, system_prompt),
+                **kwargs,
+            )
+            async with response as events:
+                async for event in events:
+                    permit.first_token()
+                    tokens = _total_tokens(event.data) or tokens
+                    if not event.data.choices:
+                        continue
+                    delta = event.data.choices[0].delta.content
+                    if isinstance(delta, str) and delta:
+                        parts.append(delta)
+                        yield delta
+        # Only reached when the stream ran to completion, so partial output is never cached
+        self._cache_store(key, "".join(parts), started, tokens)
 
     async def parse(
         self,
@@ -43,23 +261,29 @@ class MistralService:
         response_model: Type[T],
         model: str | None = None,
         system_prompt: str | None = None,
+        use_cache: bool = True,
     ) -> T:
         """Structured output via Mistral — returns a parsed Pydantic model."""
-        model = model or self._settings.mistral_large_model
-        msgs = []
-        if system_prompt:
-            msgs.append({"role": "system", "content": system_prompt})
-        msgs.extend(messages)
+        requested = model or self._settings.mistral_large_model
+        key = self._cache_key(use_cache, "json", requested, system_prompt, messages)
+        raw = self._cache_lookup(key, requested)
+        if raw is not None:
+            return response_model.model_validate_json(raw)
 
-        response = await self._client.chat.complete_async(
-            model=model,
-            messages=msgs,
-            response_format={
-                "type": "json_object",
-            },
-        )
+        started = time.monotonic()
+        async with self._completion(requested) as (model, _):
+            response = await self._client.chat.complete_async(
+                model=model,
+                messages=self._build_messages(messages, system_prompt),
+                response_format={
+                    "type": "json_object",
+                },
+            )
         raw = response.choices[0].message.content
-        return response_model.model_validate_json(raw)
+        parsed = response_model.model_validate_json(raw)
+        # Cache only output that validated
+        self._cache_store(key, raw, started, _total_tokens(response))
+        return parsed
 
     async def create_agent(
         self,
@@ -71,12 +295,13 @@ class MistralService:
     ) -> str:
         """Create a Mistral agent and return its ID."""
         model = model or self._settings.mistral_medium_model
-        agent = await self._client.beta.agents.create_async(
-            model=model,
-            name=name,
-            instructions=instructions,
-            description=description,
-        )
+        async with self._limiter.slot():
+            agent = await self._client.beta.agents.create_async(
+                model=model,
+                name=name,
+                instructions=instructions,
+                description=description,
+            )
         return agent.id
 
     async def agent_chat(
@@ -85,18 +310,29 @@ class MistralService:
         messages: list[dict],
     ) -> str:
         """Chat with a Mistral agent."""
-        response = await self._client.beta.agents.complete_async(
-            agent_id=agent_id,
-            messages=messages,
-        )
+        async with self._limiter.slot():
+            response = await self._client.beta.agents.complete_async(
+                agent_id=agent_id,
+                messages=messages,
+            )
         return response.choices[0].message.content
 
 
+def _total_tokens(response) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
 _service: MistralService | None = None
 
 
 def get_mistral_service() -> MistralService:
     global _service
     if _service is None:
-        _service = MistralService()
+        if get_settings().simulate_providers:
+            from backend.services.simulation import SimulatedMistralService
+
+            _service = SimulatedMistralService()
+        else:
+            _service = MistralService()
     return _service
@@ -0,0 +1,321 @@
+"""Provider simulation — in-process stand-ins for Mistral, ElevenLabs and HuggingFace.
+
+With `simulate_providers` on, the get_*_service() getters return the
+Simulated*Service classes below. They subclass the real services and only
+swap the SDK / HTTP client, so caching, rate limiting, circuit breakers and
+model fallback run exactly as in production. The fake clients:
+
+- wait a latency drawn from a log-normal distribution around a configured median,
+- fail a configured share of calls with a 503, shaped like the real SDK's error,
+- stream text token by token at a configured rate,
+- return placeholder PNG / MP3 bytes and deterministic embeddings.
+
+No network access or API keys are needed, which makes this the mode for load
+tests and benchmarks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import struct
+import uuid
+import zlib
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+import httpx
+import numpy as np
+from elevenlabs.core.api_error import ApiError
+from mistralai.models import SDKError
+
+from backend.config import get_settings
+from backend.services.elevenlabs_service import ElevenLabsService
+from backend.services.huggingface_service import HuggingFaceService
+from backend.services.mistral_service import MistralService
+
+EMBEDDING_DIM = 384
+
+FILLER = (
+    "This is simulated output standing in for a real model response. "
+    "It has a realistic length and arrives token by token, so everything "
+    "downstream of the provider behaves as it would under real traffic."
+).split()
+
+_rng: random.Random | None = None
+
+
+def get_rng() -> random.Random:
+    """Shared generator for simulated latency and errors, seeded from `sim_seed`."""
+    global _rng
+    if _rng is None:
+        _rng = random.Random(get_settings().sim_seed)
+    return _rng
+
+
+def sample_latency(median_ms: float) -> float:
+    """Seconds drawn from a log-normal distribution with the given median."""
+    sigma = get_settings().sim_latency_sigma
+    return median_ms / 1000 * math.exp(sigma * get_rng().gauss(0, 1))
+
+
+def should_fail() -> bool:
+    return get_rng().random() < get_settings().sim_error_rate
+
+
+def _error_response(url: str) -> httpx.Response:
+    return httpx.Response(
+        503,
+        json={"detail": "Simulated provider overload"},
+        request=httpx.Request("POST", url),
+    )
+
+
+# --- Placeholder media ---
+
+def placeholder_png(width: int = 64, height: int = 64, seed: str = "") -> bytes:
+    """A valid solid-colour PNG; the colour is derived from `seed`."""
+    color = zlib.crc32(seed.encode()).to_bytes(4, "big")[:3]
+    row = b"\x00" + color * width  # filter byte + RGB pixels
+    raw = zlib.compress(row * height)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", raw) + chunk(b"IEND", b"")
+
+
+# One silent MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, 1152 samples (~26 ms)
+_MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+_MP3_FRAMES_PER_SECOND = 44100 / 1152
+
+
+def placeholder_mp3(seconds: float) -> bytes:
+    """Silent MP3 of roughly `seconds` duration."""
+    return _MP3_FRAME * max(1, round(seconds * _MP3_FRAMES_PER_SECOND))
+
+
+# --- Deterministic embeddings ---
+
+_token_vectors: dict[str, np.ndarray] = {}
+
+
+def _token_vector(token: str) -> np.ndarray:
+    vector = _token_vectors.get(token)
+    if vector is None:
+        rng = np.random.default_rng(zlib.crc32(token.encode()))
+        vector = _token_vectors[token] = rng.standard_normal(EMBEDDING_DIM).astype(np.float32)
+    return vector
+
+
+def simulated_embedding(text: str) -> list[float]:
+    """Hashed bag of word stems: texts sharing words get similar vectors."""
+    stems = {w[:5] for w in "".join(c if c.isalnum() else " " for c in text.lower()).split()}
+    if not stems:
+        return [0.0] * EMBEDDING_DIM
+    vector = np.sum([_token_vector(s) for s in stems], axis=0)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+# --- Mistral ---
+
+def _last_user_message(messages: list[dict]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content", ""))
+    return ""
+
+
+def _decomposition(text: str) -> str:
+    """A plausible orchestrator plan: one subtask per skill the text mentions."""
+    from backend.protocol.classifier import detect_skills_by_keyword
+
+    skills = detect_skills_by_keyword(text)
+    subtasks = []
+    for skill in skills:
+        dependencies = []
+        if skill.value == "voice" and subtasks and subtasks[0]["required_skill"] == "writing":
+            dependencies = [0]  # narrate the written script
+        subtasks.append({
+            "title": f"{skill.value.capitalize()} deliverable",
+            "description": f"Produce the {skill.value} part of: {text[:200]}",
+            "required_skill": skill.value,
+            "dependencies": dependencies,
+        })
+    return json.dumps({
+        "reasoning": "Simulated decomposition, one subtask per detected skill.",
+        "subtasks": subtasks,
+        "estimated_total_minutes": len(subtasks) * 2,
+    })
+
+
+def _response_text(messages: list[dict], json_mode: bool) -> str:
+    if json_mode:
+        return _decomposition(_last_user_message(messages))
+    prompt = " ".join(_last_user_message(messages).split()[:12])
+    words = [f"[simulated] {prompt}."]
+    target = get_settings().sim_mistral_response_tokens
+    while len(words) < target:
+        words.extend(FILLER)
+    return " ".join(words[:target])
+
+
+def _tokens(text: str) -> list[str]:
+    """Split into whitespace-preserving pieces, roughly one per word."""
+    pieces, start = [], 0
+    for i, ch in enumerate(text):
+        if ch == " " and i > start:
+            pieces.append(text[start:i])
+            start = i
+    pieces.append(text[start:])
+    return pieces
+
+
+def _completion(content: str, prompt_chars: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(total_tokens=prompt_chars // 4 + len(_tokens(content))),
+    )
+
+
+class _SimulatedEventStream:
+    """Mirrors the SDK's streaming response: an async context manager over events."""
+
+    def __init__(self, text: str, prompt_chars: int, chunk_tokens: int = 4):
+        self._text = text
+        self._prompt_chars = prompt_chars
+        self._chunk_tokens = chunk_tokens
+
+    async def __aenter__(self):
+        return self._events()
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _events(self) -> AsyncIterator[SimpleNamespace]:
+        settings = get_settings()
+        tokens = _tokens(self._text)
+        await asyncio.sleep(sample_latency(settings.sim_mistral_first_token_ms))
+        delay = self._chunk_tokens / settings.sim_mistral_tokens_per_second
+        for i in range(0, len(tokens), self._chunk_tokens):
+            if i:
+                await asyncio.sleep(delay)
+            delta = "".join(tokens[i:i + self._chunk_tokens])
+            yield SimpleNamespace(data=SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))],
+                usage=None,
+            ))
+        yield SimpleNamespace(data=SimpleNamespace(
+            choices=[],
+            usage=SimpleNamespace(total_tokens=self._prompt_chars // 4 + len(tokens)),
+        ))
+
+
+class _SimulatedChat:
+    def _check(self):
+        if should_fail():
+            response = _error_response("https://api.mistral.ai/v1/chat/completions")
+            raise SDKError("Simulated provider overload", 503, response.text, response)
+
+    async def complete_async(self, model: str, messages: list[dict], response_format: dict | None = None, **_):
+        settings = get_settings()
+        text = _response_text(messages, json_mode=response_format is not None)
+        seconds = sample_latency(settings.sim_mistral_first_token_ms)
+        seconds += len(_tokens(text)) / settings.sim_mistral_tokens_per_second
+        await asyncio.sleep(seconds)
+        self._check()
+        return _completion(text, sum(len(str(m.get("content", ""))) for m in messages))
+
+    async def stream_async(self, model: str, messages: list[dict], response_format: dict | None = None, **_):
+        self._check()
+        text = _response_text(messages, json_mode=response_format is not None)
+        return _SimulatedEventStream(text, sum(len(str(m.get("content", ""))) for m in messages))
+
+
+class _SimulatedAgents:
+    def __init__(self, chat: _SimulatedChat):
+        self._chat = chat
+
+    async def create_async(self, model: str, name: str, **_):
+        await asyncio.sleep(sample_latency(get_settings().sim_mistral_first_token_ms))
+        return SimpleNamespace(id=f"sim-agent-{uuid.uuid4().hex[:8]}")
+
+    async def complete_async(self, agent_id: str, messages: list[dict], **_):
+        return await self._chat.complete_async(model=agent_id, messages=messages)
+
+
+class SimulatedMistralClient:
+    """The subset of the `Mistral` SDK surface that MistralService uses."""
+
+    def __init__(self):
+        self.chat = _SimulatedChat()
+        self.beta = SimpleNamespace(agents=_SimulatedAgents(self.chat))
+
+
+class SimulatedMistralService(MistralService):
+    def _make_client(self) -> SimulatedMistralClient:
+        return SimulatedMistralClient()
+
+
+# --- ElevenLabs ---
+
+class _SimulatedTextToSpeech:
+    async def convert(self, voice_id: str, text: str, model_id: str, output_format: str, **_):
+        settings = get_settings()
+        await asyncio.sleep(sample_latency(settings.sim_elevenlabs_latency_ms))
+        if should_fail():
+            raise ApiError(status_code=503, body={"detail": "Simulated provider overload"})
+        # About 15 characters of speech per second, delivered in ~1 s chunks
+        audio = placeholder_mp3(len(text) / 15)
+        chunk = len(_MP3_FRAME) * round(_MP3_FRAMES_PER_SECOND)
+        for i in range(0, len(audio), chunk):
+            yield audio[i:i + chunk]
+
+
+class SimulatedElevenLabsClient:
+    """The subset of the `AsyncElevenLabs` SDK surface that ElevenLabsService uses."""
+
+    def __init__(self):
+        self.text_to_speech = _SimulatedTextToSpeech()
+
+
+class SimulatedElevenLabsService(ElevenLabsService):
+    def _make_client(self) -> SimulatedElevenLabsClient:
+        return SimulatedElevenLabsClient()
+
+
+# --- HuggingFace ---
+
+class SimulatedHTTPClient:
+    """Answers HuggingFace router POSTs: feature extraction gets embeddings, anything else an image."""
+
+    async def post(self, url: str, headers: dict | None = None, json: dict | None = None, **_) -> httpx.Response:
+        settings = get_settings()
+        payload = json or {}
+        is_embedding = "feature-extraction" in url
+        median = settings.sim_hf_embedding_latency_ms if is_embedding else settings.sim_hf_image_latency_ms
+        await asyncio.sleep(sample_latency(median))
+        if should_fail():
+            return _error_response(url)
+
+        request = httpx.Request("POST", url)
+        if is_embedding:
+            inputs = payload.get("inputs", [])
+            texts = [inputs] if isinstance(inputs, str) else inputs
+            return httpx.Response(200, json=[simulated_embedding(t) for t in texts], request=request)
+        parameters = payload.get("parameters") or {}
+        image = placeholder_png(
+            int(parameters.get("width", 64)),
+            int(parameters.get("height", 64)),
+            seed=str(payload.get("inputs", "")),
+        )
+        return httpx.Response(200, content=image, headers={"content-type": "image/png"}, request=request)
+
+
+class SimulatedHuggingFaceService(HuggingFaceService):
+    def _make_http(self) -> SimulatedHTTPClient:
+        return SimulatedHTTPClient()
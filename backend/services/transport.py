@@ -0,0 +1,120 @@
+"""Provider transport — one shared, pooled httpx.AsyncClient per provider host.
+
+Every provider SDK is handed the same long-lived client for its host, so
+connections (and their TLS sessions) are reused across calls instead of being
+re-established under bursty load. HTTP/2 is used when the `h2` package is
+installed, multiplexing concurrent requests over a single connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+
+import httpx
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_HOSTS = {
+    "mistral": "https://api.mistral.ai",
+    "elevenlabs": "https://api.elevenlabs.io",
+    "huggingface": "https://router.huggingface.co",
+}
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class ProviderTransport:
+    """Lazily builds and owns the per-provider clients."""
+
+    def __init__(self):
+        self._settings = get_settings()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        if self._settings.provider_http2 and not HTTP2_AVAILABLE:
+            logger.warning(
+                "provider_http2 is on but the h2 package is not installed "
+                "(pip install 'httpx[http2]'); provider calls will use HTTP/1.1"
+            )
+
+    @property
+    def http2(self) -> bool:
+        return self._settings.provider_http2 and HTTP2_AVAILABLE
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        if provider not in PROVIDER_HOSTS:
+            raise ValueError(f"Unknown provider '{provider}'")
+        if provider not in self._clients:
+            s = self._settings
+            self._clients[provider] = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=s.provider_max_connections,
+                    max_keepalive_connections=s.provider_max_keepalive_connections,
+                    keepalive_expiry=s.provider_keepalive_expiry_seconds,
+                ),
+                timeout=httpx.Timeout(
+                    s.provider_read_timeout_seconds,
+                    connect=s.provider_connect_timeout_seconds,
+                    pool=s.provider_pool_timeout_seconds,
+                ),
+                follow_redirects=True,
+            )
+        return self._clients[provider]
+
+    async def warm_up(self, providers: list[str]):
+        """Open a connection to each provider host so the first real call skips the handshake.
+
+        Any HTTP response counts as warm; failures are logged and ignored.
+        """
+
+        async def _touch(provider: str):
+            try:
+                await self.client(provider).head(
+                    PROVIDER_HOSTS[provider],
+                    timeout=self._settings.provider_warmup_timeout_seconds,
+                )
+            except httpx.HTTPError as e:
+                logger.warning("Warm-up for %s failed: %s", provider, e)
+
+        await asyncio.gather(*(_touch(p) for p in providers))
+
+    def stats(self) -> dict:
+        """Connection counts per provider, read from the httpcore pool."""
+        return {
+            "http2": self.http2,
+            "providers": {
+                provider: _pool_stats(client) for provider, client in self._clients.items()
+            },
+        }
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        await asyncio.gather(*(c.aclose() for c in clients.values()), return_exceptions=True)
+
+
+def _pool_stats(client: httpx.AsyncClient) -> dict:
+    # httpcore keeps these as internals; read defensively so an upgrade degrades to zeros
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    requests = list(getattr(pool, "_requests", []) or [])
+    idle = sum(1 for c in connections if getattr(c, "is_idle", lambda: False)())
+    waiting = sum(1 for r in requests if getattr(r, "is_queued", lambda: False)())
+    return {
+        "open": len(connections),
+        "idle": idle,
+        "active": len(connections) - idle,
+        "waiting": waiting,
+    }
+
+
+_transport: ProviderTransport | None = None
+
+
+def get_transport() -> ProviderTransport:
+    global _transport
+    if _transport is None:
+        _transport = ProviderTransport()
+    return _transport
@@ -5,6 +5,7 @@ const EVENT_ICONS = {
   job_decomposed: { icon: ArrowRight, color: 'text-purple-400' },
   subtask_assigned: { icon: Circle, color: 'text-blue-400' },
   subtask_started: { icon: Loader, color: 'text-amber-400' },
+  subtask_retrying: { icon: Loader, color: 'text-amber-400' },
   subtask_completed: { icon: CheckCircle, color: 'text-green-400' },
   subtask_failed: { icon: AlertCircle, color: 'text-red-400' },
   handoff: { icon: ArrowRight, color: 'text-purple-400' },
@@ -23,6 +24,7 @@ function eventLabel(event) {
     case 'job_decomposed': return `Decomposed into ${d.subtask_count} subtasks`
     case 'subtask_assigned': return `${d.agent_name} assigned: ${d.skill}`
     case 'subtask_started': return `${d.title} started`
+    case 'subtask_retrying': return `${d.title} retrying (attempt ${d.attempt}) after: ${d.error || 'unknown'}`
     case 'subtask_completed': return `${d.title} completed (${d.deliverable_type})`
     case 'subtask_failed': return `${d.title} failed: ${d.error || 'unknown'}`
     case 'handoff': return `Handoff: ${d.source_name} → ${d.target_name}`
@@ -27,11 +27,21 @@ function StatusBadge({ status }) {
 function JobDetail({ jobId }) {
   const [job, setJob] = useState(null)
   const [events, setEvents] = useState([])
+  const [drafts, setDrafts] = useState({})
 
   useEffect(() => {
     fetchJob(jobId).then(setJob)
 
     const ws = connectJobWS(jobId, (event) => {
+      // Streamed output goes to the subtask's live draft, not the timeline
+      if (event.type === 'subtask_delta') {
+        // Offset 0 starts a new attempt: a retried subtask's draft starts over
+        setDrafts(prev => ({
+          ...prev,
+          [event.subtask_id]: (event.data.offset === 0 ? '' : prev[event.subtask_id] || '') + event.data.delta,
+        }))
+        return
+      }
       setEvents(prev => [...prev, event])
       // Refresh job data on key events
       if (['job_completed', 'job_failed', 'subtask_completed'].includes(event.type)) {
@@ -65,10 +75,15 @@ function JobDetail({ jobId }) {
             <h3 className="text-xs font-semibold text-gray-400 uppercase tracking-wider mb-3">Subtasks</h3>
             <div className="space-y-2">
               {job.subtasks.map(st => (
-                <div key={st.id} className="flex items-center gap-3 py-2 px-3 rounded-lg bg-white/5">
-                  <StatusBadge status={st.status} />
-                  <span className="text-sm flex-1">{st.title}</span>
-                  <span className="text-xs text-gray-500">{st.required_skill}</span>
+                <div key={st.id} className="py-2 px-3 rounded-lg bg-white/5">
+                  <div className="flex items-center gap-3">
+                    <StatusBadge status={st.status} />
+                    <span className="text-sm flex-1">{st.title}</span>
+                    <span className="text-xs text-gray-500">{st.required_skill}</span>
+                  </div>
+                  {drafts[st.id] && st.status !== 'completed' && (
+                    <pre className="mt-2 max-h-48 overflow-y-auto whitespace-pre-wrap text-xs text-gray-300">{drafts[st.id]}</pre>
+                  )}
                 </div>
               ))}
             </div>